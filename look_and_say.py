@@ -12,25 +12,146 @@
 .. include:: ./docs/ACKNOWLEDGMENTS.md
 """
 
+import array
+import bisect
+import collections
+import concurrent.futures
+import contextlib
+import fractions
+import gzip
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import time
+import warnings
+try:
+    from multiprocessing import shared_memory
+except ImportError: # pragma: no cover
+    shared_memory = None # Python < 3.8
+
+import mpmath
 import numpy
 import sympy
 
 ################## Conway's Conventions ############################
 
+# Strings at least this long are split by split_Conway with a vectorized numpy scan
+_SPLIT_NUMPY_THRESHOLD = 2**10
+
 def split_Conway(string):
     """
     Splits a string into a list of substrings according to Conway's Splitting Theorem.
     Assumes the string is not empty. 
     For example, split_Conway('1211132213') returns ['12', '1113', '22', '13'].
+    The string can also be given as ``bytes``, a ``memoryview`` or an ``mmap``, 
+    in which case the chunks are slices of it. 
+    """
+    if isinstance(string, str) and len(string) < _SPLIT_NUMPY_THRESHOLD:
+        # The Splitting Theorem only splits between distinct characters, and only 
+        # looks at one character to the left and six characters to the right.
+        chunks = []
+        start = 0
+        for i in range(1, len(string)):
+            if string[i] != string[i - 1] and _is_split_pair_Conway(string[i - 1], string[i:i + 6]):
+                chunks.append(string[start:i])
+                start = i
+        chunks.append(string[start:])
+        return chunks
+    bounds = split_Conway_boundaries(string).tolist()
+    return [string[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+def split_Conway_boundaries(string):
+    """
+    Returns the positions where ``split_Conway`` splits a string as a numpy array, 
+    starting with 0 and ending with the length of the string, so that the chunks are 
+    ``string[bounds[k]:bounds[k+1]]``. The string can be a ``str``, ``bytes``, 
+    a ``memoryview`` or an ``mmap``. The string is scanned once without being copied 
+    into substrings: the conditions of the Splitting Theorem are evaluated at every 
+    boundary between runs at once, looking at most six characters ahead.
+    """
+    if isinstance(string, str):
+        try:
+            codes = numpy.frombuffer(string.encode('latin-1'), dtype = numpy.uint8)
+        except UnicodeEncodeError:
+            codes = numpy.frombuffer(string.encode('utf-32-le'), dtype = numpy.uint32)
+    else:
+        codes = numpy.frombuffer(string, dtype = numpy.uint8)
+    n = len(codes)
+    # Positions past the end of the string hold the sentinel -1
+    padded = numpy.full(n + 6, -1, dtype = numpy.int64)
+    padded[:n] = codes
+    candidates = numpy.flatnonzero(codes[1:] != codes[:-1]) + 1
+    end = -1
+    one, two, three = ord('1'), ord('2'), ord('3')
+    left = padded[candidates - 1]
+    r0, r1, r2, r3, r4, r5 = [padded[candidates + k] for k in range(6)]
+    def small(x):
+        return (x == one) | (x == two) | (x == three)
+    split = ~small(left) & small(r0) # n] and [m
+    # 2] followed by [1^1X^1, [1^3, [3^1X^\not=3 or [n^1
+    split |= (left == two) & (
+        ((r0 == one) & (r1 != end) & (r1 != one) & (r2 != r1))
+        | ((r0 == one) & (r1 == one) & (r2 == one) & (r3 != one))
+        | ((r0 == three) & ((r1 == end) | ((r1 != three) & ((r3 == end) | (r2 != r1) | (r3 != r1)))))
+        | (~small(r0) & (r1 != r0)))
+    # \not=2] followed by [2^21^1X^1, [2^21^3, [2^23^1X^\not=3 or [2^2n^(0 or 1)
+    split |= (left != two) & (r0 == two) & (r1 == two) & (
+        ((r2 == one) & (r3 != end) & (r3 != one) & (r4 != r3))
+        | ((r2 == one) & (r3 == one) & (r4 == one) & (r5 != one))
+        | ((r2 == three) & ((r3 == end) | ((r3 != three) & ((r5 == end) | (r4 != r3) | (r5 != r3)))))
+        | (r2 == end)
+        | ((r2 != end) & ~small(r2) & (r3 != r2)))
+    return numpy.concatenate(([0], candidates[split], [n]))
+
+def _split_positions_Conway(text, lo, hi):
+    """
+    Returns the positions i with ``lo <= i < hi`` (and ``lo >= 1``) where ``split_Conway`` splits ``text``, 
+    as a list. Only ``text[lo-1:hi+5]`` is looked at, so the positions are final 
+    as long as the text has at least five more characters after position hi (or ends before them).
+    """
+    window = text[lo - 1:hi + 5]
+    if len(window) >= _SPLIT_NUMPY_THRESHOLD:
+        return [p for p in (split_Conway_boundaries(window)[1:-1] + (lo - 1)).tolist() if p < hi]
+    if not isinstance(window, str):
+        window = bytes(window).decode('latin-1')
+    return [lo - 1 + i for i in range(1, hi - lo + 1) 
+            if window[i] != window[i - 1] and _is_split_pair_Conway(window[i - 1], window[i:i + 6])]
+
+def iter_split_Conway(chunks):
+    """
+    Splits a string given as an iterable of pieces (``str`` or bytes-like) according to Conway's 
+    Splitting Theorem, yielding the chunks of ``split_Conway`` one at a time (as ``str`` or ``bytes``). 
+    A chunk is yielded as soon as the six characters after it have been read, so only the current 
+    chunk and this lookahead are kept in memory. For example, the pieces can be blocks read from a file.
     """
-    chunks = []
+    buffer = None
+    position = 1 # the first position of the buffer which has not been checked for a split
+    for piece in chunks:
+        if not isinstance(piece, str):
+            piece = bytes(piece)
+        buffer = piece if buffer is None else buffer + piece
+        if len(buffer) - 5 > position:
+            start = 0
+            for p in _split_positions_Conway(buffer, position, len(buffer) - 5):
+                yield buffer[start:p]
+                start = p
+            buffer = buffer[start:]
+            position = len(buffer) - 5
+    if buffer is None:
+        return
     start = 0
-    for i in range(1, len(string)):
-        if _is_split_pair_Conway(string[start:i], string[i:]):
-            chunks.append(string[start:i])
-            start = i
-    chunks.append(string[start:])
-    return chunks
+    for p in _split_positions_Conway(buffer, position, len(buffer)):
+        yield buffer[start:p]
+        start = p
+    yield buffer[start:]
 
 def _is_split_pair_Conway(L, R):
     """Implementation of Conway's Splitting Theorem"""
@@ -83,6 +204,97 @@ def _conway_number(element):
 
 ################# LOOK AND SAY #################################
 
+# Matches a maximal run d^n of a single character d (capturing the run and d)
+_RUN = re.compile(r'((.)\2*)', re.DOTALL)
+
+# Maximum number of memoized chunk decays kept by each LookAndSay object
+_CHUNK_TABLE_SIZE = 4096
+
+# Maximum number of memoized atom decays kept by each Chemistry object
+_ATOM_DECAYS_SIZE = 2**16
+
+# Engines for say_what_you_see, and the length of strings from which 'auto' uses numpy
+_ENGINES = ['auto', 'python', 'numpy']
+_NUMPY_THRESHOLD = 2**12
+
+def _decimal_say(n):
+    """The say function for standard decimal look and say sequences."""
+    return str(n)
+
+def _run_aligned_bounds(data, shards):
+    """
+    Cuts the nonempty bytes-like object ``data`` into about ``shards`` pieces 
+    without cutting through any run. Returns a list of (start, stop) pairs.
+    """
+    digits = numpy.frombuffer(data, dtype = numpy.uint8)
+    cuts = [0]
+    for target in range(len(digits) // shards, len(digits), max(len(digits) // shards, 1)):
+        cut = max(target, cuts[-1] + 1)
+        if cut >= len(digits):
+            break
+        # move the cut forward to the start of the next run:
+        window = 2**10
+        while cut < len(digits) and digits[cut] == digits[cut - 1]:
+            different = numpy.flatnonzero(digits[cut:cut + window] != digits[cut - 1])
+            cut = cut + int(different[0]) if len(different) else min(cut + window, len(digits))
+            window *= 2
+        if cut < len(digits):
+            cuts.append(cut)
+    cuts.append(len(digits))
+    return list(zip(cuts[:-1], cuts[1:]))
+
+def _say_shard(las, data):
+    """
+    Applies the say-what-you-see operation to a shard of a string (as bytes) with the engine 
+    of ``las``. Returns None if the say function produces a character which is not a single byte.
+    """
+    try:
+        if las.engine == 'python':
+            return las._say_python(bytes(data).decode('latin-1')).encode('latin-1')
+        return las._say_bytes(data)
+    except UnicodeEncodeError:
+        return None
+
+def _say_shared_shard(las, name, start, stop):
+    """Applies the say-what-you-see operation to a shard of a string in shared memory (see ``_say_shard``)."""
+    block = shared_memory.SharedMemory(name = name)
+    shard = block.buf[start:stop]
+    try:
+        return _say_shard(las, shard)
+    finally:
+        shard.release() # the block cannot be closed while the shard is exported
+        block.close()
+
+def _last_term(terms):
+    last = None
+    for last in terms:
+        pass
+    return last
+
+def _term_lengths(terms):
+    return [len(term) for term in terms]
+
+# The named reducers for LookAndSay.iter_batch
+_BATCH_REDUCERS = {'last': _last_term, 'lengths': _term_lengths}
+
+def _evolve_seeds(las, seeds, terms, reducer):
+    """Returns a list of pairs (seed, result) for a chunk of seeds (see LookAndSay.iter_batch)."""
+    return [(seed, reducer(las.iter_sequence(seed, terms))) for seed in seeds]
+
+def _bounded_map(pool, function, arguments, window):
+    """
+    Like ``pool.map(function, *zip(*arguments))``, but only submits a new task when 
+    fewer than ``window`` tasks are in progress, so the iterable ``arguments`` of 
+    argument tuples is consumed lazily. The results are yielded in order.
+    """
+    pending = collections.deque()
+    for args in arguments:
+        pending.append(pool.submit(function, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
 class LookAndSay():
     """
     A class responsible for the fundamental say-what-you-see operation
@@ -95,26 +307,108 @@ class LookAndSay():
 
     When no parameter is passed to the constructor, the LookAndSay
     object will correspond to standard decimal look and say sequences.
+
+    The parameter ``engine`` selects how runs are detected by ``say_what_you_see``:
+
+    * ``engine='python'`` uses a pure python scan of the string.
+    * ``engine='numpy'`` uses a vectorized numpy kernel. This requires every character 
+      (including those produced by the say function) to be a single byte; otherwise 
+      the python engine is used.
+    * ``engine='auto'`` (the default) uses the numpy kernel for strings of at least 
+      ``_NUMPY_THRESHOLD`` characters, and the python engine for shorter strings.
+
+    Every engine produces identical results.
+
+    The parameter ``workers`` sets the number of processes used by ``say_what_you_see`` 
+    on strings of at least ``parallel_threshold`` characters (``workers = None`` uses 
+    every CPU). Such strings are cut into shards at the boundaries of runs, and the shards 
+    are processed in a process pool reading the string from shared memory. This requires 
+    the say function to be picklable (e.g. defined at the top level of a module) and every 
+    character to be a single byte; otherwise the string is processed in a single process.
+    The pool is started on first use and kept for later calls until ``close_pool()`` is called.
     """
-    def __init__(self, say = None):
+    def __init__(self, say = None, engine = 'auto', workers = 1, parallel_threshold = 2**24):
+        assert engine in _ENGINES, "Invalid engine passed to LookAndSay. Valid engines are 'auto', 'python', and 'numpy'."
         super(LookAndSay, self).__init__()
         self._is_Conway = False
         if say == None:
-            say = (lambda n : str(n))
+            say = _decimal_say
             self._is_Conway = True
         self.say = say
+        self.engine = engine
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
         self.sequence = []
+        self._say_chunk = self._resolve_say_chunk(say)
+        self._chunk_table = {}
+        self._pool = None
+
+    def __getstate__(self):
+        # The sequence is not needed (and potentially huge) when sending 
+        # the object to another process, the resolved say function may be a lambda, 
+        # and the process pool belongs to this process.
+        state = self.__dict__.copy()
+        state['sequence'] = []
+        state['_pool'] = None
+        del state['_say_chunk']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._pool = None
+        self._say_chunk = self._resolve_say_chunk(self.say)
+
+    @staticmethod
+    def _resolve_say_chunk(say):
+        """
+        Returns a two parameter function computing the decay of the chunk $d^n$. 
+        The arity of the say function is determined once here, rather than 
+        by trial and error on every chunk. If the signature of the say function 
+        cannot be inspected (e.g. for some builtins), we fall back on trial and error.
+        """
+        try:
+            signature = inspect.signature(say)
+        except (TypeError, ValueError):
+            def say_chunk(char_count, char):
+                try:
+                    return say(char_count, char)
+                except:
+                    return say(char_count) + char
+            return say_chunk
+        positional = [p for p in signature.parameters.values() 
+                      if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+        if len([p for p in positional if p.default is p.empty]) >= 2:
+            return say
+        if len(positional) < 2 and not any(p.kind == p.VAR_POSITIONAL for p in signature.parameters.values()):
+            return lambda char_count, char : say(char_count) + char
+        # The second parameter is optional (e.g. numpy.base_repr), so the say function 
+        # is tried with two parameters on the first chunk and the choice is kept.
+        chosen = []
+        def say_chunk(char_count, char):
+            if chosen:
+                return chosen[0](char_count, char)
+            try:
+                said = say(char_count, char)
+                chosen.append(say)
+            except Exception:
+                chosen.append(lambda char_count, char : say(char_count) + char)
+                said = chosen[0](char_count, char)
+            return said
+        return say_chunk
 
     def _chunk_op(self, char_count, char):
         """
-        Conversion of the say function to a two parameter function 
-        if the say function takes only one parameter; 
-        just a copy of the say function otherwise.
+        Returns the decay of the chunk $d^n$ where $d$ is ``char`` and $n$ is ``char_count``. 
+        Results are memoized in a table holding at most ``_CHUNK_TABLE_SIZE`` chunks,
+        so the say function is assumed to be deterministic.
         """
-        try:
-            return self.say(char_count, char)
-        except:
-            return self.say(char_count) + char
+        key = (char_count, char)
+        said = self._chunk_table.get(key)
+        if said is None:
+            said = self._say_chunk(char_count, char)
+            if len(self._chunk_table) < _CHUNK_TABLE_SIZE:
+                self._chunk_table[key] = said
+        return said
 
     def say_what_you_see(self, string):
         """
@@ -124,18 +418,131 @@ class LookAndSay():
         ``say_what_you_see('1112222333')`` returns ``'314233'``.
         """
         if not string: return '' # handles empty string, which is falsy
-        letter = string[0]
-        result = ''
-        count = 0
-        for ch in string:
-            if ch == letter: 
-                count += 1
+        if self.workers != 1 and len(string) >= self.parallel_threshold:
+            result = self._say_parallel(string)
+            if result is not None:
+                return result
+        if self.engine == 'numpy' or (self.engine == 'auto' and len(string) >= _NUMPY_THRESHOLD):
+            try:
+                return self._say_bytes(string.encode('latin-1')).decode('latin-1')
+            except UnicodeEncodeError:
+                pass # some character is not a single byte
+        return self._say_python(string)
+
+    def _say_python(self, string):
+        """The say-what-you-see operation on a nonempty string, using a pure python scan."""
+        chunk_op = self._chunk_op
+        return ''.join([chunk_op(len(run), char) for run, char in _RUN.findall(string)])
+
+    def _say_bytes(self, data):
+        """
+        The say-what-you-see operation on a nonempty bytes-like object, 
+        using a vectorized numpy kernel. Returns bytes.
+        """
+        digits = numpy.frombuffer(data, dtype = numpy.uint8)
+        # Detect the runs:
+        starts = numpy.flatnonzero(digits[1:] != digits[:-1]) + 1
+        starts = numpy.concatenate(([0], starts))
+        counts = numpy.diff(numpy.append(starts, len(digits)))
+        keys = counts * 256 + digits[starts]
+        # Label each run by its type of chunk d^n:
+        key_bound = int(keys.max()) + 1
+        if key_bound <= 4 * len(keys) + 2**16:
+            chunk_keys = numpy.flatnonzero(numpy.bincount(keys, minlength = key_bound))
+            labels = numpy.zeros(key_bound, dtype = numpy.intp)
+            labels[chunk_keys] = numpy.arange(len(chunk_keys))
+            labels = labels[keys]
+        else:
+            chunk_keys, labels = numpy.unique(keys, return_inverse = True)
+        # Look up the decay of each type of chunk:
+        decays = [self._chunk_op(int(key) // 256, chr(int(key) % 256)).encode('latin-1') for key in chunk_keys]
+        decay_lengths = numpy.array([len(decay) for decay in decays])
+        table = numpy.zeros((len(decays), max(decay_lengths.max(), 1)), dtype = numpy.uint8)
+        for i, decay in enumerate(decays):
+            table[i, :len(decay)] = numpy.frombuffer(decay, dtype = numpy.uint8)
+        # Scatter the decays of the runs into the result:
+        run_lengths = decay_lengths[labels]
+        ends = numpy.cumsum(run_lengths)
+        offsets = ends - run_lengths
+        result = numpy.empty(ends[-1], dtype = numpy.uint8)
+        for j in range(table.shape[1]):
+            if decay_lengths.min() > j:
+                result[offsets + j] = table[labels, j]
             else:
-                result += self._chunk_op(count, letter)
-                count = 1
-                letter = ch 
-        result += self._chunk_op(count, letter)
-        return result
+                mask = run_lengths > j
+                result[offsets[mask] + j] = table[labels[mask], j]
+        return result.tobytes()
+
+    def _say_parallel(self, string):
+        """
+        The say-what-you-see operation using a pool of processes. 
+        Returns None if the string cannot be processed in parallel.
+        """
+        try:
+            data = string.encode('latin-1')
+            pickle.dumps(self)
+        except (UnicodeEncodeError, pickle.PicklingError, AttributeError, TypeError):
+            return None
+        pool, workers = self._get_pool()
+        bounds = _run_aligned_bounds(data, 4 * workers)
+        if shared_memory is None:
+            shards = list(pool.map(_say_shard, itertools.repeat(self), [data[a:b] for a, b in bounds]))
+        else:
+            block = shared_memory.SharedMemory(create = True, size = len(data))
+            try:
+                block.buf[:len(data)] = data
+                del data
+                shards = list(pool.map(_say_shared_shard, itertools.repeat(self), itertools.repeat(block.name), 
+                                       *zip(*bounds)))
+            finally:
+                block.close()
+                block.unlink()
+        if any(shard is None for shard in shards):
+            return None # some decay is not a single byte per character
+        return b''.join(shards).decode('latin-1')
+
+    def _get_pool(self):
+        """
+        Returns the process pool used by ``say_what_you_see`` and its number of workers, 
+        starting a new pool if there is none yet or if ``workers`` has changed.
+        """
+        workers = self.workers or os.cpu_count() or 1
+        if self._pool is not None and self._pool[1] != workers:
+            self.close_pool()
+        if self._pool is None:
+            self._pool = (concurrent.futures.ProcessPoolExecutor(workers), workers)
+        return self._pool
+
+    def close_pool(self):
+        """Shuts down the process pool kept by ``say_what_you_see``, if any."""
+        if self._pool is not None:
+            self._pool[0].shutdown()
+            self._pool = None
+
+    def benchmark_engines(self, string, repeat = 3):
+        """
+        Times the say-what-you-see operation on ``string`` using the python engine and 
+        the numpy engine (keeping the best of ``repeat`` runs of each), after checking 
+        that both engines give the same result. Returns a dictionary with the 
+        times (in seconds) for each engine and the speedup of numpy over python.
+        """
+        engine = self.engine
+        times = {}
+        results = {}
+        try:
+            for self.engine in ['python', 'numpy']:
+                best = None
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    results[self.engine] = self.say_what_you_see(string)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                times[self.engine] = best
+        finally:
+            self.engine = engine
+        assert results['python'] == results['numpy'], 'The python and numpy engines disagree.'
+        times['speedup'] = times['python'] / times['numpy'] if times['numpy'] else float('inf')
+        return times
      
     def generate_sequence(self, seed, terms):
         """
@@ -144,10 +551,92 @@ class LookAndSay():
         number of terms generated.
         """
         if not seed: return None # handles empty seed, which is falsy
-        result = [seed]
-        for _ in range(terms-1):
-            result.append(self.say_what_you_see(result[-1]))
-        self.sequence = result
+        self.sequence = list(self.iter_sequence(seed, max(terms, 1))) # the seed is always kept
+
+    def iter_sequence(self, seed, terms = None):
+        """
+        Lazily generates the look and say sequence, yielding the terms one at a time. 
+        Only the current term is kept alive, so this can be used to run far more 
+        terms than ``generate_sequence``. The parameter ``seed`` is the initial term 
+        in the sequence, and ``terms`` is the number of terms generated. 
+        When ``terms = None`` the sequence goes on forever.
+        """
+        if not seed: return # handles empty seed, which is falsy
+        term = seed
+        count = 0
+        while terms is None or count < terms:
+            yield term
+            count += 1
+            if terms is None or count < terms:
+                term = self.say_what_you_see(term)
+
+    def iter_term_stats(self, seed, terms = None):
+        """
+        Lazily generates statistics for each term of the look and say sequence.
+        For each term this yields a dictionary with the ``'length'`` of the term 
+        and a ``'histogram'`` dictionary counting the occurrences of each digit. 
+        The parameters are the same as for ``iter_sequence``. For example, 
+        the ratios of lengths of successive terms can be computed
+        from the lengths without ever holding more than one term in memory.
+        """
+        for term in self.iter_sequence(seed, terms):
+            yield {'length': len(term), 'histogram': dict(collections.Counter(term))}
+
+    def iter_batch(self, seeds, terms, reducer = 'last', workers = None, chunksize = 64):
+        """
+        Generates the look and say sequences for many seeds using a pool of processes, 
+        yielding a pair ``(seed, result)`` for each seed in the order of the seeds.
+        The parameter ``seeds`` is an iterable of seeds, ``terms`` is the number of terms 
+        of each sequence, and the result for each sequence is determined by ``reducer``:
+
+        * ``reducer='last'``: the last term of the sequence.
+        * ``reducer='lengths'``: the list of lengths of the terms of the sequence.
+        * Otherwise ``reducer`` is a function which is passed an iterator over the terms of the sequence.
+
+        Seeds are sent to the processes in chunks of ``chunksize`` seeds, and only a few chunks 
+        are in progress at any time, so neither the seeds nor the sequences are all kept in memory.
+        When ``workers = 1`` everything is done in the current process; otherwise 
+        ``workers`` processes are used (``None`` uses every CPU), and the say function and 
+        reducer need to be picklable (e.g. defined at the top level of a module).
+        """
+        reducer = _BATCH_REDUCERS.get(reducer, reducer)
+        seeds = iter(seeds)
+        chunks = iter(lambda : list(itertools.islice(seeds, chunksize)), [])
+        if workers == 1:
+            for chunk in chunks:
+                yield from _evolve_seeds(self, chunk, terms, reducer)
+            return
+        workers = workers or os.cpu_count() or 1
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            for results in _bounded_map(pool, _evolve_seeds, ((self, chunk, terms, reducer) for chunk in chunks), 2 * workers):
+                yield from results
+
+    def stream_say_what_you_see(self, data, write, block_size = 2**24):
+        """
+        The say-what-you-see operation for huge terms. The term is passed as a nonempty 
+        bytes-like object ``data`` (e.g. a ``memoryview`` of a memory-mapped file, as 
+        returned by a ``SequenceStore``), which is processed in blocks of about 
+        ``block_size`` bytes without cutting through any runs. The result is passed 
+        block by block (as bytes) to the function ``write``.
+        """
+        for start, stop in _run_aligned_bounds(data, -(-len(data) // block_size)):
+            write(self._say_bytes(data[start:stop]))
+
+    def store_sequence(self, store, seed, terms, block_size = 2**24):
+        """
+        Generates the look and say sequence into the ``SequenceStore`` object ``store``, 
+        so that the terms are written to disk rather than kept in memory. The parameter ``seed`` 
+        is the initial term in the sequence, and ``terms`` is the number of terms generated. 
+        If the store already holds some terms of the sequence, the generation resumes 
+        from the last stored term.
+        """
+        if not seed: return None # handles empty seed, which is falsy
+        if len(store) == 0:
+            store.append(seed)
+        assert store.get_term(0) == seed, 'The store holds a look and say sequence with a different seed.'
+        while len(store) < terms:
+            with store.writer() as write:
+                self.stream_say_what_you_see(store[-1], write, block_size)
 
     def get_sequence(self):
         """Returns the look and say sequence as a list of strings"""
@@ -171,8 +660,494 @@ class LookAndSay():
 
 
 
+########### SEQUENCE STORE ################
+
+class SequenceStore():
+    """
+    A class for keeping the terms of a look and say sequence on disk rather than in memory. 
+    The terms are appended to the file ``terms.dat`` in the given ``directory``, 
+    and the file ``index.dat`` records the offset and length of each term. 
+    The terms are read back through a memory map: ``store[i]`` is a ``memoryview``
+    of the bytes of the ith term, which does not copy the term into memory. 
+    A store can be reopened (e.g. by another process) to continue a sequence 
+    with ``LookAndSay.store_sequence``. Every character of the stored terms must be a single byte.
+    """
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok = True)
+        self.directory = directory
+        self._data_path = os.path.join(directory, 'terms.dat')
+        self._index_path = os.path.join(directory, 'index.dat')
+        self._index = array.array('Q')
+        if os.path.exists(self._index_path):
+            with open(self._index_path, 'rb') as f:
+                index = f.read()
+            # drop a partially written entry:
+            self._index.frombytes(index[:len(index) - len(index) % (2 * self._index.itemsize)])
+        self._maps = []
+        self._mapped_size = 0
+
+    def __len__(self):
+        return len(self._index) // 2
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('SequenceStore index out of range')
+        offset, length = self._index[2*i], self._index[2*i + 1]
+        if length == 0:
+            return memoryview(b'')
+        if offset + length > self._mapped_size:
+            self._remap()
+        return memoryview(self._maps[-1])[offset:offset + length]
+
+    def _remap(self):
+        self._close_maps()
+        with open(self._data_path, 'rb') as f:
+            self._maps.append(mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ))
+        self._mapped_size = len(self._maps[-1])
+
+    def get_term(self, i):
+        """Returns the ith term as a string."""
+        return bytes(self[i]).decode('latin-1')
+
+    def append(self, term):
+        """Appends the string ``term`` to the store."""
+        with self.writer() as write:
+            write(term.encode('latin-1'))
+
+    @contextlib.contextmanager
+    def writer(self):
+        """
+        A context manager for appending a term to the store piece by piece. 
+        It provides a function which writes bytes to the end of the new term.
+        The term is only added to the index once the context is exited without an error.
+        """
+        end = self._index[-2] + self._index[-1] if len(self) else 0
+        mode = 'r+b' if os.path.exists(self._data_path) else 'w+b'
+        with open(self._data_path, mode) as f:
+            f.truncate(end) # drop anything left over from an interrupted write
+            f.seek(end)
+            yield f.write
+            length = f.tell() - end
+        with open(self._index_path, 'ab') as f:
+            f.write(array.array('Q', [end, length]).tobytes())
+        self._index.extend([end, length])
+
+    def _close_maps(self):
+        # Maps may still be viewed by memoryviews of terms, so they are only closed when possible.
+        for m in self._maps:
+            try:
+                m.close()
+            except BufferError:
+                pass
+        self._maps = [m for m in self._maps if not m.closed]
+
+    def close(self):
+        """Closes the memory maps of the store which are no longer viewed by memoryviews of terms."""
+        self._close_maps()
+        self._mapped_size = 0
+
 ########### CHEMISTRY #####################
 
+# Age (in days) after which the terms of a look and say sequence are split into atoms
+_SPLIT_AGE = 2
+
+# Version of the format written by Chemistry.save
+_SAVE_FORMAT_VERSION = 1
+
+# Number of terms of each seed's look and say sequence used to fingerprint a chemistry
+_FINGERPRINT_TERMS = 6
+
+# Run lengths of the chunks d^n on which the say function is probed to fingerprint a chemistry
+_FINGERPRINT_COUNTS = list(range(1, 33)) + [64, 100, 128, 1000, 1024]
+
+def _read_shard(source, start, stop):
+    """
+    Returns ``source[start:stop]`` as a string (decoded as latin-1), where ``source`` is 
+    ``('shm', name)`` for a block of shared memory, ``('file', path)`` for a file, 
+    or ``('bytes', data)`` for a bytes object.
+    """
+    kind, location = source
+    if kind == 'bytes':
+        return location[start:stop].decode('latin-1')
+    if kind == 'shm':
+        block = shared_memory.SharedMemory(name = location)
+        try:
+            return bytes(block.buf[start:stop]).decode('latin-1')
+        finally:
+            block.close()
+    with open(location, 'rb') as f:
+        f.seek(start)
+        return f.read(stop - start).decode('latin-1')
+
+def _shard_atoms(split, text, length):
+    """
+    Returns the atoms of ``text[:length]``, where ``text`` starts at a split of a term and 
+    goes on past ``length`` (also a split) far enough to decide the splits before ``length``. 
+    For ``split_Conway`` and split functions from a ``SplitFuncFactory`` these are exactly the 
+    atoms of the term; other split functions are applied to ``text[:length]`` alone.
+    """
+    if split is split_Conway:
+        positions = _split_positions_Conway(text, 1, length)
+    elif isinstance(getattr(split, '__self__', None), SplitFuncFactory):
+        positions = itertools.takewhile(lambda p : p < length, split.__self__._split_positions([text], str))
+    else:
+        return split(text[:length])
+    bounds = [0, *positions, length]
+    return [text[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+def _count_shard(split, source, start, stop, length):
+    """Counts the atoms of the first ``length`` characters of a shard ``source[start:stop]`` of a term (see ``_shard_atoms``)."""
+    return collections.Counter(_shard_atoms(split, _read_shard(source, start, stop), length))
+
+def _split_fails(las, left, right, days):
+    """
+    Returns the first day (from 1 to ``days``) on which ``left`` and ``right`` evolved 
+    separately differ from ``left + right`` evolved as a whole, or None if they never do.
+    """
+    whole = left + right
+    for day in range(1, days + 1):
+        left, right, whole = las.say_what_you_see(left), las.say_what_you_see(right), las.say_what_you_see(whole)
+        if left + right != whole:
+            return day
+    return None
+
+def _is_failing_split(las, split, left, right, days):
+    """Checks whether ``split(left + right)`` splits after ``left`` and that split fails within ``days`` days."""
+    positions = itertools.accumulate(len(chunk) for chunk in split(left + right))
+    return len(left) in positions and _split_fails(las, left, right, days) is not None
+
+def _minimal_failing_pair(las, split, atoms, boundary, days):
+    """
+    Searches for a short failing pair (L, R) around the split between ``atoms[boundary - 1]`` 
+    and ``atoms[boundary]``: the atoms on either side are included until the split fails, 
+    and then characters are removed from the far ends of L and R while the split still fails.
+    Returns None if the split does not fail within ``days`` days.
+    """
+    for extra in range(max(boundary, len(atoms) - boundary)):
+        left = ''.join(atoms[max(boundary - 1 - extra, 0):boundary])
+        right = ''.join(atoms[boundary:boundary + 1 + extra])
+        if _is_failing_split(las, split, left, right, days):
+            break
+    else:
+        return None
+    shrunk = True
+    while shrunk:
+        shrunk = False
+        for shorter in [(left[1:], right), (left, right[:-1])]:
+            if shorter[0] and shorter[1] and _is_failing_split(las, split, *shorter, days):
+                left, right = shorter
+                shrunk = True
+                break
+    return left, right
+
+def _term_runs(las, term):
+    """
+    Returns the positions where the runs of the nonempty string ``term`` start and the lengths 
+    of their decays under ``las``, as numpy arrays.
+    """
+    try:
+        digits = numpy.frombuffer(term.encode('latin-1'), dtype = numpy.uint8)
+    except UnicodeEncodeError:
+        runs = [(m.start(), len(las._chunk_op(len(m.group(1)), m.group(2)))) for m in _RUN.finditer(term)]
+        return numpy.array([r[0] for r in runs], dtype = numpy.int64), numpy.array([r[1] for r in runs], dtype = numpy.int64)
+    starts = numpy.concatenate(([0], numpy.flatnonzero(digits[1:] != digits[:-1]) + 1))
+    counts = numpy.diff(numpy.append(starts, len(digits)))
+    chunk_keys, labels = numpy.unique(counts * 256 + digits[starts], return_inverse = True)
+    decay_lengths = numpy.array([len(las._chunk_op(int(key) // 256, chr(int(key) % 256))) for key in chunk_keys], dtype = numpy.int64)
+    return starts.astype(numpy.int64), decay_lengths[labels]
+
+def _validate_seed(las, split, seed, days, start_day, stop = None):
+    """
+    Checks the splits of the terms of the sequence starting with ``seed`` (the seed is day 1) 
+    from ``start_day`` to ``days``. Each split is followed through the later terms: a split between 
+    L and R holds for one more day exactly when it falls between two runs, and then it moves to 
+    the position given by the length of the decay of L. So every split is checked in a single pass 
+    over the terms. Returns None if every split holds (or the event ``stop`` is set), and otherwise 
+    a report (see ``Chemistry.validate_split``) of a split which fails first.
+    """
+    terms = {}
+    # The followed splits: their positions in the current term, and the days and positions they came from
+    tracked = numpy.empty(0, dtype = numpy.int64)
+    origin_days = numpy.empty(0, dtype = numpy.int64)
+    origin_positions = numpy.empty(0, dtype = numpy.int64)
+    term = seed
+    for day in range(1, days):
+        if stop is not None and stop.is_set():
+            return None
+        if day >= start_day:
+            terms[day] = term
+            new = numpy.fromiter(itertools.accumulate(len(chunk) for chunk in split(term)), dtype = numpy.int64)
+            new = new[(new > 0) & (new < len(term))]
+            positions = numpy.concatenate((tracked, new))
+            from_days = numpy.concatenate((origin_days, numpy.full(len(new), day, dtype = numpy.int64)))
+            from_positions = numpy.concatenate((origin_positions, new))
+            # Keep the split which has been followed the longest at each position
+            order = numpy.lexsort((from_days, positions))
+            keep = numpy.concatenate(([True], positions[order][1:] != positions[order][:-1])) if len(order) else order
+            tracked, origin_days, origin_positions = positions[order][keep], from_days[order][keep], from_positions[order][keep]
+        if len(tracked):
+            starts, decay_lengths = _term_runs(las, term)
+            index = numpy.minimum(numpy.searchsorted(starts, tracked), len(starts) - 1)
+            inside = starts[index] != tracked
+            if inside.any():
+                # The split from the earliest day which falls inside a run fails tomorrow
+                failing = numpy.flatnonzero(inside)
+                failing = failing[numpy.argmin(origin_days[failing])]
+                return _split_report(las, split, seed, terms, int(origin_days[failing]), int(origin_positions[failing]), days)
+            tracked = numpy.concatenate(([0], numpy.cumsum(decay_lengths)))[index]
+        term = las.say_what_you_see(term)
+    return None
+
+def _split_report(las, split, seed, terms, day, position, days):
+    """Returns the report of ``Chemistry.validate_split`` for the failing split at ``position`` in the term of the given day."""
+    atoms = split(terms[day])
+    boundary = list(itertools.accumulate(len(atom) for atom in atoms)).index(position) + 1
+    left, right = _minimal_failing_pair(las, split, atoms, boundary, days - day)
+    return {'seed': seed, 'day': day, 'failed_day': day + _split_fails(las, left, right, days - day),
+            'left': left, 'right': right, 'atoms': atoms[boundary - 1:boundary + 1]}
+
+def _strongly_connected_components(successors):
+    """
+    Returns the strongly connected components of a directed graph (as lists of vertices) 
+    using an iterative version of Tarjan's algorithm. The vertices are 0, 1, ..., n-1 and 
+    ``successors[i]`` lists the heads of the edges from i. The components are listed so that 
+    every edge goes from a component to itself or to a later component.
+    """
+    index = [None] * len(successors)
+    lowlink = [0] * len(successors)
+    on_stack = [False] * len(successors)
+    stack = []
+    components = []
+    counter = 0
+    for root in range(len(successors)):
+        if index[root] is not None:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(successors[root]))]
+        while work:
+            v, edges = work[-1]
+            for w in edges:
+                if index[w] is None:
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(successors[w])))
+                    break
+                elif on_stack[w]:
+                    lowlink[v] = min(lowlink[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    lowlink[u] = min(lowlink[u], lowlink[v])
+                if lowlink[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component.append(w)
+                        if w == v:
+                            break
+                    components.append(component)
+    # Tarjan's algorithm finds the components in reverse topological order:
+    components.reverse()
+    return components
+
+def _is_cyclic(component, successors):
+    """Returns True if the strongly connected component contains a cycle."""
+    return len(component) > 1 or component[0] in successors[component[0]]
+
+def _x_pow_mod(exponent, modulus):
+    """
+    Returns the coefficients of x^exponent mod the given monic polynomial 
+    as a list of integers starting with the constant term. 
+    The coefficients of the modulus are given starting with the leading coefficient.
+    """
+    degree = len(modulus) - 1
+    if degree == 0:
+        return []
+    # x^degree = -(lower terms of the modulus), listed from the constant term up:
+    reducer = numpy.array(modulus[:0:-1], dtype = object)
+    def reduce(poly):
+        for d in range(len(poly) - 1, degree - 1, -1):
+            if poly[d]:
+                poly[d - degree:d] -= poly[d] * reducer
+        return poly[:degree]
+    result = numpy.array([1] + [0] * degree, dtype = object)
+    result = reduce(result)
+    for bit in bin(exponent)[2:]:
+        result = reduce(numpy.convolve(result, result))
+        if bit == '1':
+            result = reduce(numpy.concatenate([[0], result]))
+    return result.tolist()
+
+def _poly_sign(coeffs, x):
+    """
+    Returns the sign (-1, 0 or 1) of the integer polynomial with the given 
+    coefficients (starting with the leading coefficient) at the rational number x.
+    """
+    value = 0
+    for c in coeffs:
+        value = value * x + c
+    return (value > 0) - (value < 0)
+
+def _refine_root(coeffs, low, high, start, digits):
+    """
+    Returns the root of the integer polynomial with the given coefficients (starting with 
+    the leading coefficient) in the interval from ``low`` to ``high`` as an mpmath number 
+    accurate to more than ``digits`` significant digits. The polynomial must change sign on 
+    the interval and have a single root there. Newton's method is started at ``start``, 
+    and any step leaving the (shrinking) interval is replaced by a bisection step.
+    """
+    degree = len(coeffs) - 1
+    derivative = [c * (degree - i) for i, c in enumerate(coeffs[:-1])]
+    with mpmath.workdps(digits + 10):
+        low, high, x = [mpmath.mpf(q.numerator) / q.denominator if isinstance(q, fractions.Fraction) 
+                        else mpmath.mpf(q) for q in (low, high, start)]
+        low_sign = mpmath.sign(mpmath.polyval(coeffs, low))
+        tol = abs(x) * mpmath.mpf(10) ** -(digits + 5)
+        while high - low > tol:
+            value = mpmath.polyval(coeffs, x)
+            if value == 0:
+                return +x
+            if mpmath.sign(value) == low_sign:
+                low = x
+            else:
+                high = x
+            slope = mpmath.polyval(derivative, x)
+            new_x = x - value / slope if slope else low
+            if abs(new_x - x) <= tol:
+                return new_x
+            if not low < new_x < high:
+                new_x = (low + high) / 2
+            x = new_x
+        return +x
+
+def _isqrt(n):
+    """Returns the integer square root of the nonnegative integer ``n`` (as ``math.isqrt`` does in Python 3.8+)."""
+    if n < 2:
+        return n
+    x = 1 << ((n.bit_length() + 1) // 2)
+    while True:
+        y = (x + n // x) // 2
+        if y >= x:
+            return x
+        x = y
+
+def _char_poly_mod(matrix, prime):
+    """
+    Returns the coefficients of the characteristic polynomial of the square 
+    integer matrix (a numpy array) modulo ``prime``, starting with the constant term. 
+    The matrix is first reduced to upper Hessenberg form by similarity 
+    transformations, then the characteristic polynomials of its leading 
+    principal submatrices are built up one row at a time. 
+    The prime must satisfy ``n * prime**2 < 2**63`` where n is the size of the matrix.
+    """
+    n = len(matrix)
+    h = numpy.array(matrix, dtype = numpy.int64) % prime
+    for m in range(1, n - 1):
+        nonzero = numpy.flatnonzero(h[m:, m - 1])
+        if len(nonzero) == 0:
+            continue
+        i = m + nonzero[0]
+        if i != m:
+            h[[i, m], :] = h[[m, i], :]
+            h[:, [i, m]] = h[:, [m, i]]
+        # The inverse of the pivot by Fermat's little theorem
+        u = h[m + 1:, m - 1] * pow(int(h[m, m - 1]), prime - 2, prime) % prime
+        # Subtract multiples of row m from the rows below it, 
+        # then add the same multiples of those columns to column m.
+        h[m + 1:, :] = (h[m + 1:, :] - numpy.outer(u, h[m, :])) % prime
+        h[:, m] = (h[:, m] + h[:, m + 1:] @ u) % prime
+    polys = numpy.zeros((n + 1, n + 1), dtype = numpy.int64)
+    polys[0, 0] = 1
+    for m in range(1, n + 1):
+        polys[m, 1:] = polys[m - 1, :-1]
+        polys[m] = (polys[m] - h[m - 1, m - 1] * polys[m - 1]) % prime
+        multipliers = numpy.zeros(m - 1, dtype = numpy.int64)
+        t = 1
+        for i in range(1, m):
+            t = t * int(h[m - i, m - i - 1]) % prime
+            if t == 0:
+                break
+            multipliers[i - 1] = t * int(h[m - i - 1, m - 1]) % prime
+        if m > 1:
+            polys[m] = (polys[m] - multipliers @ polys[m - 2::-1]) % prime
+    return polys[n]
+
+def _char_poly_int(matrix):
+    """
+    Returns the coefficients (as integers) of the characteristic polynomial of 
+    the square integer matrix (a nested list), starting with the constant term. 
+    The polynomial is computed modulo enough primes to recover its coefficients 
+    by the Chinese remainder theorem. The coefficient of $x^{n-k}$ is a sum of 
+    principal minors of size k, so by Hadamard's inequality every coefficient 
+    is bounded by the product of $1 + r_i$ where the $r_i$ bound the norms of the rows.
+    """
+    n = len(matrix)
+    if n == 0:
+        return [1]
+    bound = 1
+    for row in matrix:
+        bound *= 2 + _isqrt(sum(a * a for a in row))
+    prime = sympy.prevprime(_isqrt((2**63 - 1) // n))
+    modulus = 1
+    coeffs = [0] * (n + 1)
+    while modulus <= 2 * bound:
+        residues = _char_poly_mod(matrix, prime).tolist()
+        # Combine with the previous residues using the Chinese remainder theorem
+        inverse = pow(modulus, prime - 2, prime) # by Fermat's little theorem
+        coeffs = [c + modulus * ((r - c) * inverse % prime) for c, r in zip(coeffs, residues)]
+        modulus *= prime
+        prime = sympy.prevprime(prime)
+    return [c - modulus if 2 * c > modulus else c for c in coeffs]
+
+class SparseDecayMatrix():
+    """
+    The decay matrix of a list of elements stored in compressed sparse column form: 
+    the nonzero entries of column j (corresponding to the decay of the jth element) 
+    are ``data[indptr[j]:indptr[j+1]]`` and they lie in the rows ``indices[indptr[j]:indptr[j+1]]``.
+    The attributes ``data``, ``indices`` and ``indptr`` are numpy arrays.
+    """
+    def __init__(self, elements):
+        index = {e: i for i, e in enumerate(elements)}
+        indptr = [0]
+        indices = []
+        data = []
+        for e in elements:
+            counts = collections.Counter(index[d] for d in e.get_decay() if d in index)
+            for i in sorted(counts):
+                indices.append(i)
+                data.append(counts[i])
+            indptr.append(len(indices))
+        self.shape = (len(elements), len(elements))
+        self.data = numpy.array(data, dtype = numpy.int64)
+        self.indices = numpy.array(indices, dtype = numpy.intp)
+        self.indptr = numpy.array(indptr, dtype = numpy.intp)
+        self._columns = numpy.repeat(numpy.arange(len(elements)), numpy.diff(self.indptr))
+
+    def dot(self, vector):
+        """Returns the product of the matrix with the given vector as a numpy array."""
+        weights = self.data * numpy.asarray(vector)[self._columns]
+        return numpy.bincount(self.indices, weights = weights, minlength = self.shape[0])
+
+    def rdot(self, vector):
+        """Returns the product of the given (row) vector with the matrix as a numpy array."""
+        weights = self.data * numpy.asarray(vector)[self.indices]
+        return numpy.bincount(self._columns, weights = weights, minlength = self.shape[1])
+
+    def todense(self):
+        """Returns the matrix as a nested list of integers (i.e. a list of the rows)."""
+        dense = numpy.zeros(self.shape, dtype = numpy.int64)
+        dense[self.indices, self._columns] = self.data
+        return dense.tolist()
+
 class Chemistry():
     """
     A class responsible for generating all the persistent elements 
@@ -185,6 +1160,9 @@ class Chemistry():
     LookAndSay object. The default splitting function corresponds to 
     Conway's original Splitting Theorem.
     """
+    eigen_tol = 1e-15
+    eigen_max_iterations = 10**5
+
     def __init__(self, las, split = split_Conway, elements = None):
         super(Chemistry, self).__init__()
         self.las = las
@@ -192,56 +1170,504 @@ class Chemistry():
         if elements == None:
             elements = []
         self.elements = elements
-        self._eigenvector = None
+        self._transient_elements = []
+        self._discovered = {e.get_string(): e for e in elements}
+        # All elements discovered by the chemistry (persistent or not), which 
+        # the decays of the elements refer to by position
+        self._registry = []
+        for e in elements:
+            if e._registry is None:
+                e._register(self._registry)
+        for e in elements:
+            e._set_decay(e.get_decay())
+        self._index_elements()
+        self._clear_caches()
+        self._atom_decays = ({}, self.las, self.split)
 
     def _split_to_elements(self, string): 
         return [Element(chunk, self.las) for chunk in self.split(string)]
 
+    def iter_split(self, pieces):
+        """
+        Splits a string given as an iterable of pieces (``str`` or bytes-like) with the splitting 
+        function of the chemistry, yielding the atoms one at a time. For ``split_Conway`` and 
+        split functions from a ``SplitFuncFactory`` only a bounded lookahead is kept in memory 
+        (see ``iter_split_Conway()`` and ``SplitFuncFactory.iter_split()``). Other split functions 
+        are applied to the whole string once all the pieces have been read.
+        """
+        if self.split is split_Conway:
+            return iter_split_Conway(pieces)
+        if isinstance(getattr(self.split, '__self__', None), SplitFuncFactory):
+            return self.split.__self__.iter_split(pieces)
+        pieces = [p if isinstance(p, str) else bytes(p) for p in pieces]
+        return iter(self.split(pieces[0][:0].join(pieces))) if pieces else iter([])
+
+    def profile_abundances(self, term, workers = None, shard_size = 2**22, dec_places = 7, abundance_sum = 100):
+        """
+        Counts the atoms of a (huge) term and compares the observed abundance of each element with 
+        the abundance predicted by the periodic table. The term can be a string, a bytes-like object, 
+        an ``mmap``, a file object (read from its current position, such as an open file, a pipe 
+        or an ``io.BytesIO``) or a path (``os.PathLike``) to a file holding the term.
+
+        The term is cut into shards of about ``shard_size`` characters at positions where 
+        the split function splits, the shards are split and counted by a pool of ``workers`` 
+        processes (all available processors when ``workers = None``), and the counts are merged. 
+        For ``split_Conway`` the cuts are found by looking a few characters around each position, 
+        and for split functions from a ``SplitFuncFactory`` by one pass over the term (which runs 
+        while the shards before are being counted). Other split functions can only be guessed at: 
+        a position is used as a cut when splitting two overlapping windows around it (starting at 
+        different positions) both split there, and a ``RuntimeWarning`` is issued. If the split 
+        function cannot be sent to other processes, or ``workers = 1``, the shards are counted 
+        in this process.
+
+        Returns a dictionary with the number of ``'atoms'`` and ``'shards'``, the ``'elements'`` 
+        (a dictionary from element names to dictionaries with the ``'count'``, the ``'observed'`` 
+        abundance and the ``'predicted'`` abundance, normalized as in ``get_periodic_table()``), 
+        and the ``'exotic'`` atoms (a ``collections.Counter`` of atoms which are not elements).
+        """
+        workers = workers or os.cpu_count() or 1
+        try:
+            pickle.dumps(self.split)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            workers = 1
+        data, path, offset, release = self._profile_data(term)
+        counts = collections.Counter()
+        shards = 0
+        try:
+            n = len(data)
+            lookahead = self._split_lookahead()
+            bounds = self._safe_split_bounds(data, shard_size)
+            if workers == 1:
+                for start, stop in bounds:
+                    text = bytes(data[start:min(stop + lookahead, n)]).decode('latin-1')
+                    counts.update(_shard_atoms(self.split, text, stop - start))
+                    shards += 1
+            else:
+                source, release_source = self._shard_source(data, path)
+                offset = offset if path is not None else 0
+                try:
+                    def arguments():
+                        for start, stop in bounds:
+                            end = min(stop + lookahead, n)
+                            if source is None:
+                                yield self.split, ('bytes', bytes(data[start:end])), 0, end - start, stop - start
+                            else:
+                                yield self.split, source, offset + start, offset + end, stop - start
+                    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                        for shard_counts in _bounded_map(pool, _count_shard, arguments(), 2 * workers):
+                            counts.update(shard_counts)
+                            shards += 1
+                finally:
+                    release_source()
+        finally:
+            release()
+        total = sum(counts.values())
+        abundances = self._get_abundances(dec_places, abundance_sum)
+        elements = {}
+        for e, predicted in zip(self.get_elements(), abundances):
+            count = counts.pop(e.get_string(), 0)
+            observed = round(abundance_sum * count / total, dec_places) if total else 0.0
+            elements[e.get_name()] = {'count': count, 'observed': observed, 'predicted': predicted}
+        return {'atoms': total, 'shards': shards, 'elements': elements, 'exotic': counts}
+
+    def validate_split(self, seeds, days, workers = None, start_day = _SPLIT_AGE):
+        """
+        Tests that the split function of the chemistry is valid for its LookAndSay object on the 
+        sequences starting with each of the ``seeds``. On each day from ``start_day`` to ``days`` 
+        (the seed being day 1), every term is split into atoms. The split is valid when the atoms 
+        evolve independently up to day ``days``, i.e. when ``say(L) + say(R) == say(LR)`` for every 
+        split of a term into ``L`` and ``R`` on all the following days. The terms of each sequence 
+        are generated once, and every split is followed through them in the same pass.
+
+        The seeds are checked by a pool of ``workers`` processes (all available processors when 
+        ``workers = None``), and the check stops at the first seed (in the order given) with a failing 
+        split: the seeds still being checked then stop at their next day. If the LookAndSay object or 
+        the split function cannot be sent to other processes, or ``workers = 1``, the seeds are 
+        checked in this process.
+
+        Returns None if no split fails. Otherwise returns a dictionary with the ``'seed'``, the 
+        ``'day'`` of the term with the split which fails first (the earliest such term if several 
+        splits fail on the same day), the ``'atoms'`` on either side of the split, 
+        and a minimal failing pair ``'left'`` and ``'right'``: short strings which the split 
+        function splits between, but which do not evolve independently, first differing on 
+        ``'failed_day'``.
+        """
+        assert 1 <= start_day <= days, "The validate_split method requires 1 <= start_day <= days."
+        workers = workers or os.cpu_count() or 1
+        try:
+            pickle.dumps((self.las, self.split))
+        except (pickle.PicklingError, AttributeError, TypeError):
+            workers = 1
+        if workers == 1:
+            for seed in seeds:
+                report = _validate_seed(self.las, self.split, seed, days, start_day)
+                if report is not None:
+                    return report
+            return None
+        # Once a failing split is found, the seeds still being checked stop at their next day
+        with multiprocessing.Manager() as manager:
+            stop = manager.Event()
+            try:
+                with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+                    tasks = ((self.las, self.split, seed, days, start_day, stop) for seed in seeds)
+                    for report in _bounded_map(pool, _validate_seed, tasks, 2 * workers):
+                        if report is not None:
+                            stop.set()
+                            return report
+            finally:
+                stop.set()
+        return None
+
+    def _profile_data(self, term):
+        """
+        Returns the term as a bytes-like object, the path of a file holding it from some offset 
+        (or None), that offset, and a function releasing them once the profile is done. 
+        A file object is read from its current position.
+        """
+        if isinstance(term, os.PathLike):
+            path = os.fspath(term)
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b'', None, 0, lambda : None
+                data = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+            return data, path, 0, data.close
+        if hasattr(term, 'read'):
+            try:
+                fileno = term.fileno()
+                offset = term.tell()
+                data = mmap.mmap(fileno, 0, access = mmap.ACCESS_READ)
+            except (io.UnsupportedOperation, AttributeError, OSError, ValueError):
+                # In-memory streams, pipes, sockets and empty files
+                if hasattr(term, 'getbuffer'):
+                    view = term.getbuffer()[term.tell():]
+                    return view, None, 0, view.release
+                data = term.read()
+                return (data.encode('latin-1') if isinstance(data, str) else data), None, 0, lambda : None
+            view = memoryview(data)[offset:]
+            def release():
+                view.release()
+                data.close()
+            # Workers can read the file themselves if it is still found under its name
+            path = getattr(term, 'name', None)
+            try:
+                status, file_status = os.stat(path), os.fstat(fileno)
+                if (status.st_dev, status.st_ino) != (file_status.st_dev, file_status.st_ino):
+                    path = None
+            except (OSError, TypeError, ValueError):
+                path = None
+            return view, path, offset, release
+        data = term.encode('latin-1') if isinstance(term, str) else term
+        return data, None, 0, lambda : None
+
+    @staticmethod
+    def _shard_source(data, path):
+        """
+        Returns a description of where worker processes can read the term (see ``_read_shard``), 
+        or None if each shard has to be sent to them, and a function releasing it. 
+        Terms which are not in a file are copied into shared memory.
+        """
+        if path is not None:
+            return ('file', path), lambda : None
+        if shared_memory is None:
+            return None, lambda : None
+        block = shared_memory.SharedMemory(create = True, size = len(data))
+        block.buf[:len(data)] = data
+        def release():
+            block.close()
+            block.unlink()
+        return ('shm', block.name), release
+
+    def _split_lookahead(self):
+        """Returns how many characters after a position the split function looks at to decide whether it splits there."""
+        if self.split is split_Conway:
+            return 5
+        if isinstance(getattr(self.split, '__self__', None), SplitFuncFactory):
+            return self.split.__self__._compile(str)[2]
+        return 0
+
+    def _safe_split_bounds(self, data, shard_size):
+        """
+        Cuts the bytes-like ``data`` into shards of about ``shard_size`` characters at positions 
+        where the split function splits. Yields (start, stop) pairs.
+        """
+        n = len(data)
+        if n == 0:
+            return
+        if isinstance(getattr(self.split, '__self__', None), SplitFuncFactory):
+            # A split depends on where the previous split is, so the splits are found in one pass
+            block = 2**16
+            pieces = (bytes(data[i:i + block]).decode('latin-1') for i in range(0, n, block))
+            start = 0
+            for position in self.split.__self__._split_positions(pieces, str):
+                if position - start >= shard_size:
+                    yield start, position
+                    start = position
+            yield start, n
+            return
+        if self.split is not split_Conway and n > shard_size:
+            warnings.warn('The shards of the term are cut where the split function appears to split, '
+                          'which may miscount atoms for split functions that are not split_Conway or '
+                          'made by a SplitFuncFactory.', RuntimeWarning)
+        start = 0
+        target = shard_size
+        while target < n:
+            cut = self._safe_split_after(data, max(target, start + 1))
+            if cut is None:
+                break
+            yield start, cut
+            start = cut
+            target = cut + shard_size
+        yield start, n
+
+    def _safe_split_after(self, data, target):
+        """Returns a position at least ``target`` where ``data`` splits, or None if none is found."""
+        n = len(data)
+        window = 2**10
+        while True:
+            stop = min(target + window, n)
+            if self.split is split_Conway:
+                positions = _split_positions_Conway(data, target, stop)
+                if positions:
+                    return positions[0]
+            else:
+                # A split found from two different starting points is taken to be a split of the whole term
+                agreed = None
+                for start in [max(target - window, 0), max(target - 2 * window, 0)]:
+                    positions = set(itertools.accumulate(len(c) for c in self.split(bytes(data[start:min(stop + window, n)]).decode('latin-1'))))
+                    positions = {start + p for p in positions if target <= start + p < stop}
+                    agreed = positions if agreed is None else agreed & positions
+                if agreed:
+                    return min(agreed)
+            if stop == n:
+                return None
+            window *= 2
+
+    def _decay_atom(self, string):
+        """
+        Returns the decay of an atom as a tuple of atoms (as strings). Decays are memoized 
+        for at most ``_ATOM_DECAYS_SIZE`` atoms, and forgotten when ``las`` or ``split`` is replaced.
+        """
+        decays, las, split = self._atom_decays
+        if las is not self.las or split is not self.split:
+            decays = {}
+            self._atom_decays = (decays, self.las, self.split)
+        decay = decays.get(string)
+        if decay is None:
+            decay = tuple(self.split(self.las.say_what_you_see(string)))
+            if len(decays) < _ATOM_DECAYS_SIZE:
+                decays[string] = decay
+        return decay
+
     def _generate_all_elements(self, strings):
+        # Every element is discovered once, via a dictionary from strings to elements 
+        # which is kept between calls, and then its decay is computed from a worklist 
+        # (rather than by recursion). Returns the newly discovered elements.
+        index = self._discovered
+        discovered = []
+        worklist = []
+        def discover(chunk):
+            elt = index.get(chunk)
+            if elt is None:
+                elt = Element(chunk, self.las)
+                elt._register(self._registry)
+                index[chunk] = elt
+                discovered.append(elt)
+                worklist.append(elt)
+            return elt
         for string in strings:
-            for elt in self._split_to_elements(string):
-                if elt not in self.elements:
-                    # add elt to the chemistry:
-                    self.elements.append(elt)
-                    # recursively set the decay for elt:
-                    decay_elts = self._split_to_elements(self.las.say_what_you_see(elt.get_string()))
-                    self._generate_all_elements(map(lambda e : e.get_string(), decay_elts))
-                    elt._set_decay(decay_elts)
-        # clean up decay for all elements:
-        for elt in self.elements:
-            dec = []
-            for d in elt.get_decay():
-                dec += [e for e in self.elements if e == d]
-            elt._set_decay(dec)
-
-    def _remove_intermittent_elements(self): 
-        while True:
-            common_elements = []
-            for elt in self.elements:
-                for d in elt.get_decay():
-                    if d not in common_elements:
-                        common_elements.append(d)
-            if len(common_elements) < len(self.elements):
-                self.elements = list(common_elements)
-            else: 
-                break # pragma: no cover
-
-    def generate_elements(self, *seeds):
+            for chunk in self.split(string):
+                discover(chunk)
+        while worklist:
+            elt = worklist.pop()
+            elt._set_decay([discover(chunk) for chunk in self._decay_atom(elt.get_string())])
+        return discovered
+
+    def _remove_intermittent_elements(self, candidates): 
+        # An element persists exactly when it can be reached from a cycle in the decay graph.
+        # The cycles are found from the strongly connected components of the decay graph.
+        # Elements outside the candidates are already known to persist (and never decay 
+        # into candidates), so only the candidates need to be examined. Returns the persistent 
+        # candidates, the transient candidates and the components of the persistent candidates.
+        successors = self._decay_graph(candidates)
+        components = _strongly_connected_components(successors)
+        persistent = [False] * len(candidates)
+        stack = [i for comp in components if _is_cyclic(comp, successors) for i in comp]
+        for i in stack:
+            persistent[i] = True
+        while stack:
+            for j in successors[stack.pop()]:
+                if not persistent[j]:
+                    persistent[j] = True
+                    stack.append(j)
+        return ([e for i, e in enumerate(candidates) if persistent[i]],
+                [e for i, e in enumerate(candidates) if not persistent[i]],
+                [[candidates[i] for i in comp] for comp in components if persistent[comp[0]]])
+
+    @staticmethod
+    def _decay_graph(elements):
+        """
+        Returns the decay graph of the list of elements as a list of lists: 
+        the ith list holds the positions (in the list of elements) of the decay of the ith element.
+        """
+        index = {e: i for i, e in enumerate(elements)}
+        return [[index[d] for d in e.get_decay() if d in index] for e in elements]
+
+    def get_components(self):
+        """
+        Returns the strongly connected components of the decay graph of the elements 
+        (as lists of elements). Two elements are in the same component when each 
+        appears in some descendant of the other. The components are listed so that 
+        each element decays only into elements from its own component or later components.
+        """
+        if self._components is None:
+            successors = self._decay_graph(self.elements)
+            self._components = [[self.elements[i] for i in comp] for comp in _strongly_connected_components(successors)]
+        return self._components
+
+    def get_core_elements(self):
+        """
+        Returns the list of elements which lie on a cycle of the decay graph, i.e. 
+        the elements which appear in some descendant of themselves. These are 
+        the elements in components with more than one element, along with the elements 
+        appearing in their own decay. Every persistent element descends from these elements.
+        """
+        return [e for comp in self.get_components() 
+                if len(comp) > 1 or comp[0] in comp[0].get_decay() for e in comp]
+
+    def get_transient_elements(self):
+        """
+        Returns the list of elements which were found by ``generate_elements()`` but only 
+        appear in the first few terms of the look and say sequences (and are therefore 
+        not included in the list of elements).
+        """
+        return self._transient_elements
+
+    def generate_elements(self, *seeds, cache_dir = None):
         """
         Collects all the persistent elements from all the look and
         say sequences generated by the given seeds. The string(s) entered as the 
         parameter(s) will be used as the seed(s) for generating the elements. 
         This method will clear any elements in the chemistry that exist 
         before this method is called (i.e. prior to collecting from the new seeds). 
+
+        If a directory ``cache_dir`` is given, the chemistry is loaded from there when it 
+        has been generated before. Otherwise it is generated, its dominant eigenvector and 
+        characteristic polynomial are computed, and it is saved in ``cache_dir``. 
+        Saved chemistries are identified by the seeds and by the outputs of the say 
+        and split functions on the first few terms of the seeds' look and say sequences.
         """
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, self._fingerprint(seeds) + '.json.gz')
+            if os.path.exists(path):
+                self.load(path)
+                return
+            self.generate_elements(*seeds)
+            self.solve_perron()
+            self._get_char_poly_coeffs()
+            os.makedirs(cache_dir, exist_ok = True)
+            self.save(path)
+            return
 
         self.clear_elements()
         strings = [self.las.say_what_you_see(seed) for seed in seeds] #only look at 2-day-old strings
-        self._generate_all_elements(strings)
-        self._remove_intermittent_elements()
+        self.elements, self._transient_elements, components = self._remove_intermittent_elements(self._generate_all_elements(strings))
+        self._components = components
         self.order_elements('string')
         self._name_elements()
 
+    def add_seeds(self, *seeds):
+        """
+        Adds the persistent elements from the look and say sequences generated by the given 
+        seeds to the existing elements, giving the same elements (with the same names and order) as 
+        passing all seeds at once to ``generate_elements()``. Only the elements reachable from 
+        the new seeds are discovered, and only those elements (along with the elements previously 
+        found to be transient) are checked for persistence. The next computation of the 
+        dominant eigenvector starts from the previous one.
+        """
+        strings = [self.las.say_what_you_see(seed) for seed in seeds] #only look at 2-day-old strings
+        candidates = self._generate_all_elements(strings) + self._transient_elements
+        persistent, self._transient_elements, components = self._remove_intermittent_elements(candidates)
+        if not persistent:
+            return
+        components = None if self._components is None else components + self._components
+        perron_report = self._perron_report
+        self._clear_caches()
+        self._perron_report = perron_report
+        self._components = components
+        self.elements = self.elements + persistent
+        self.order_elements('string')
+        self._name_elements()
+
+    def _fingerprint(self, seeds):
+        """
+        Returns a hexadecimal digest identifying the chemistry generated by the given seeds. 
+        It depends on the class, the seeds, whether the elements get Conway's names, the outputs 
+        of the say function on the chunks $d^n$ for a fixed set of run lengths n and every digit d 
+        (the decimal digits and the characters of the first few terms of the sequences of the seeds), 
+        and the outputs of the split function on those terms.
+        """
+        probes = []
+        for seed in seeds:
+            probes.extend(self.las.iter_sequence(seed, _FINGERPRINT_TERMS))
+        digits = sorted(set('0123456789').union(*probes))
+        chunks = [d * n for d in digits for n in _FINGERPRINT_COUNTS]
+        digest = hashlib.sha256()
+        for part in [type(self).__name__, _SAVE_FORMAT_VERSION, list(seeds), self.las._is_Conway,
+                     [self.las.say_what_you_see(c) for c in chunks], [list(self.split(p)) for p in probes]]:
+            digest.update(json.dumps(part).encode())
+        return digest.hexdigest()
+
+    def save(self, path):
+        """
+        Saves the elements (with their names and decays), the elements found to be transient, 
+        and any computed dominant eigenvector, dominant eigenvalue and characteristic polynomial 
+        to the file ``path`` as gzipped JSON. The file is written atomically, so a chemistry 
+        being saved is never seen half written. Use ``load()`` to read it back.
+        """
+        atoms = self.elements + self._transient_elements
+        index = {id(e): i for i, e in enumerate(atoms)}
+        data = {'format': 'look_and_say.Chemistry',
+                'version': _SAVE_FORMAT_VERSION,
+                'class': type(self).__name__,
+                'elements': [[e.get_string(), e.get_name(), [index[id(d)] for d in e.get_decay()]] for e in self.elements],
+                'transient': [[e.get_string(), [index[id(d)] for d in e.get_decay()]] for e in self._transient_elements],
+                'perron': None,
+                'char_poly': self._char_poly_coeffs}
+        report = self._perron_report
+        if report is not None and set(report['eigenvector']) == set(self.elements):
+            data['perron'] = dict(report, eigenvector = [report['eigenvector'][e] for e in self.elements])
+        temp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with gzip.open(temp_path, 'wt', encoding = 'utf-8') as f:
+            json.dump(data, f, separators = (',', ':'))
+        os.replace(temp_path, path)
+
+    def load(self, path):
+        """
+        Replaces the elements of the chemistry by the elements saved to the file ``path`` by ``save()``.
+        The LookAndSay object and the splitting function of the chemistry are not saved, 
+        so the chemistry loading the file should use the same ones as the chemistry that saved it.
+        """
+        with gzip.open(path, 'rt', encoding = 'utf-8') as f:
+            data = json.load(f)
+        assert data.get('format') == 'look_and_say.Chemistry', "The file {} does not contain a saved chemistry.".format(path)
+        assert data['version'] == _SAVE_FORMAT_VERSION, "The file {} was saved in an unsupported format (version {}).".format(path, data['version'])
+        self.clear_elements()
+        atoms = [Element(string, self.las) for string, *_ in data['elements'] + data['transient']]
+        for e in atoms:
+            e._register(self._registry)
+        for e, (_, name, decay) in zip(atoms, data['elements']):
+            e.set_name(name)
+            e._set_decay([atoms[i] for i in decay])
+        for e, (_, decay) in zip(atoms[len(data['elements']):], data['transient']):
+            e._set_decay([atoms[i] for i in decay])
+        self.elements = atoms[:len(data['elements'])]
+        self._transient_elements = atoms[len(data['elements']):]
+        self._discovered = {e.get_string(): e for e in atoms}
+        if data['perron'] is not None:
+            self._perron_report = dict(data['perron'], eigenvector = dict(zip(self.elements, data['perron']['eigenvector'])))
+            self._eigenvector = self._perron_report['eigenvector']
+        self._char_poly_coeffs = data['char_poly']
+
     def _name_elements(self):
         if self.las._is_Conway:
             for e in self.get_elements():
@@ -250,6 +1676,18 @@ class Chemistry():
         else:
             for i, e in enumerate(self.get_elements()):
                 e.set_name('E' + str(i + 1))
+        self._index_elements()
+
+    def _index_elements(self):
+        # Dictionaries from names and strings to elements, which are rebuilt whenever 
+        # the list of elements is replaced or resized, or some element is renamed.
+        self._indexed_elements = (self.elements, len(self.elements), Element._renames)
+        self._elements_by_name = {e.get_name(): e for e in reversed(self.elements)}
+        self._elements_by_string = {e.get_string(): e for e in self.elements}
+
+    def _element_index_is_current(self):
+        elements, length, renames = self._indexed_elements
+        return elements is self.elements and length == len(self.elements) and renames == Element._renames
 
     def get_elements(self):
         """Returns the elements as a list."""
@@ -257,26 +1695,61 @@ class Chemistry():
 
     def get_element(self, name):
         """Returns the element with the given name. Returns None there is no element with the given name."""
-        for e in self.elements:
-            if e.get_name() == name:
-                return e
+        if not self._element_index_is_current():
+            self._index_elements()
+        return self._elements_by_name.get(name)
+
+    def element_for_string(self, string):
+        """Returns the element with the given string. Returns None if no element has the given string."""
+        if not self._element_index_is_current():
+            self._index_elements()
+        return self._elements_by_string.get(string)
 
     def clear_elements(self):
         """Resets the list of elements back to the empty list."""
         self.elements = []
+        self._transient_elements = []
+        self._discovered = {}
+        self._registry = []
+        self._index_elements()
+        self._clear_caches()
+        self._atom_decays = ({}, self.las, self.split)
+
+    def _clear_caches(self):
+        """Forgets everything computed from the elements and their decays."""
+        self._components = None
+        self._sparse_matrix = None
         self._eigenvector = None
+        self._perron_report = None
+        self._char_poly_coeffs = None
+        self._periodic_tables = None
+        self._growth_factor = None
+        self._growth_bracket = None
+        self._growth_root = None
 
     def get_periodic_table(self, dec_places = 7, abundance_sum = 100):
         """
         Creates a periodic table including each element's name, string, relative abundance, and decay.
         Returns the periodic table as a nested dictionary.
-
+        Tables are kept for each pair ``(dec_places, abundance_sum)`` until the elements, 
+        their names or their decays change, and a copy is returned.
         """
-
-        return {e.get_name() : {'string' : e.get_string(), 
-                                'abundance' : self._get_abundances(dec_places, abundance_sum)[i],
-                                'decay' : e.get_decay()}
-                                for i, e in enumerate(self.get_elements())}
+        state = self._periodic_table_state()
+        if self._periodic_tables is None or self._periodic_tables[0] != state:
+            self._periodic_tables = (state, {})
+        tables = self._periodic_tables[1]
+        if (dec_places, abundance_sum) not in tables:
+            abundances = self._get_abundances(dec_places, abundance_sum)
+            tables[(dec_places, abundance_sum)] = {e.get_name() : {'string' : e.get_string(), 
+                                                                   'abundance' : abundances[i],
+                                                                   'decay' : e.get_decay()}
+                                                                   for i, e in enumerate(self.get_elements())}
+        return {name : dict(prop, decay = list(prop['decay'])) 
+                for name, prop in tables[(dec_places, abundance_sum)].items()}
+
+    def _periodic_table_state(self):
+        """Returns a snapshot of the elements, their names and their decays used to validate cached periodic tables."""
+        return [(id(e), e.get_name(), [id(d) for d in e.get_decay()]) for e in self.elements]
 
     def print_periodic_table(self, dec_places = 7, abundance_sum = 100):
         """
@@ -299,14 +1772,21 @@ class Chemistry():
         The order of the columns and rows correspond to the order
         in the list of elements.
         """
-        mat = []
-        e = self.elements
-        for i in range(len(e)):
-            row = []
-            for j in range(len(e)):
-                row.append(e[j].get_decay().count(e[i]))
-            mat.append(row)
-        return mat
+        return self.get_sparse_decay_matrix().todense()
+
+    def get_sparse_decay_matrix(self):
+        """
+        Returns the decay matrix as a ``SparseDecayMatrix``, which only stores the nonzero entries. 
+        The order of the columns and rows correspond to the order in the list of elements.
+        The matrix is kept until the elements change.
+        """
+        if self._sparse_matrix is None or not self._is_current(self._sparse_matrix[0]):
+            self._sparse_matrix = (list(self.elements), SparseDecayMatrix(self.elements))
+        return self._sparse_matrix[1]
+
+    def _is_current(self, elements):
+        """Returns True if the given list of elements agrees with the current list of elements (in order)."""
+        return len(elements) == len(self.elements) and all(a is b for a, b in zip(elements, self.elements))
 
     def get_dom_eigenvalue(self):
         """
@@ -318,27 +1798,302 @@ class Chemistry():
         This assumption is usually guaranteed by the Perron-Frobenius Theorem.
         """
         assert len(self.elements) > 0, "The get_dom_eigenvalue method requires a nonempty list of elements.\n\tTo fix: Use the generate_elements method prior to calling get_dom_eigenvalue."
-        eigenstuff = numpy.linalg.eig(numpy.array(self.get_decay_matrix()))
-        eigenvalues = eigenstuff[0]
-        return max(eigenvalues).real
+        return self.solve_perron()['eigenvalue']
 
-    def get_char_poly(self, factor = True, latex = False):
+    def solve_perron(self, tol = None, max_iterations = None):
         """
-        Returns the characteristic polynomial of the decay matrix using sympy.
+        Computes the dominant eigenvalue of the decay matrix together with a nonnegative 
+        eigenvector (normalized to sum to 1) using power iteration on the sparse decay matrix. 
+        To guarantee convergence for periodic decay matrices, the iteration uses the decay 
+        matrix plus the identity matrix. The iteration stops once the eigenvector changes 
+        by at most ``tol`` (in the 1-norm), or after ``max_iterations`` steps, in which case 
+        a dense eigensolver is used instead. The defaults are given by the attributes 
+        ``eigen_tol`` and ``eigen_max_iterations``.
+
+        Returns a dictionary reporting the ``'eigenvalue'``, the ``'eigenvector'`` (as a 
+        dictionary from elements to entries), the number of ``'iterations'``, the ``'residual'``
+        (the 1-norm of $Mv - \\lambda v$), and whether the iteration ``'converged'``. 
+        The result is kept until the elements change and is shared by ``get_dom_eigenvalue()``,
+        ``get_periodic_table()`` and ``order_elements('abundance')``. A later call with a 
+        smaller tolerance continues the iteration from the kept eigenvector.
+        """
+        assert len(self.elements) > 0, "The solve_perron method requires a nonempty list of elements.\n\tTo fix: Use the generate_elements method prior to calling solve_perron."
+        tol = self.eigen_tol if tol is None else tol
+        max_iterations = self.eigen_max_iterations if max_iterations is None else max_iterations
+        report = self._perron_report
+        if report is not None and report['tol'] <= tol and set(report['eigenvector']) == set(self.elements):
+            return report
+        matrix = self.get_sparse_decay_matrix()
+        if report is not None:
+            # Elements added since the last solve need some mass to be found by the iteration
+            start = [report['eigenvector'].get(e, 1 / len(self.elements)) for e in self.elements]
+        else:
+            start = numpy.ones(len(self.elements))
+        vector = numpy.array(start, dtype = float)
+        vector /= vector.sum()
+        converged = False
+        iterations = 0
+        while iterations < max_iterations and not converged:
+            iterations += 1
+            new_vector = matrix.dot(vector) + vector
+            new_vector /= new_vector.sum()
+            converged = numpy.abs(new_vector - vector).sum() <= tol
+            vector = new_vector
+        if not converged:
+            eigenvalues, eigenvectors = numpy.linalg.eig(numpy.array(self.get_decay_matrix()))
+            vector = numpy.abs(eigenvectors[:, numpy.argmax(eigenvalues.real)].real)
+            vector /= vector.sum()
+        image = matrix.dot(vector)
+        eigenvalue = image.sum()
+        self._perron_report = {'eigenvalue': float(eigenvalue),
+                               'eigenvector': {e: float(x) for e, x in zip(self.elements, vector)},
+                               'iterations': iterations,
+                               'residual': float(numpy.abs(image - eigenvalue * vector).sum()),
+                               'converged': bool(converged),
+                               'tol': tol}
+        self._eigenvector = self._perron_report['eigenvector']
+        return self._perron_report
+
+    def get_char_poly(self, factor = True, latex = False, method = 'blocks'):
+        """
+        Returns the characteristic polynomial of the decay matrix as a sympy expression in ``lambda``.
         By default the returned polynomial will be factored. 
         Use ``factor = False`` to get the expanded (i.e. unfactored) polynomial. 
         Use ``latex = True`` to return the polynomial formatted in latex.
+
+        By default (``method = 'blocks'``) the decay matrix is split into the diagonal blocks 
+        given by ``get_components()``, the characteristic polynomial of each block is computed 
+        with exact modular arithmetic, and the results are multiplied together. 
+        Use ``method = 'sympy'`` to have sympy compute the polynomial of the whole matrix instead.
         """
-        chi = sympy.Matrix(self.get_decay_matrix()).charpoly()
-        if factor:
-            chi = sympy.factor(chi.as_expr())
+        assert method in ['blocks', 'sympy'], "Invalid method passed to get_char_poly. Valid methods are 'blocks' and 'sympy'."
+        lam = sympy.Symbol('lambda')
+        if method == 'sympy':
+            chi = sympy.Matrix(self.get_decay_matrix()).charpoly(lam)
+            chi = sympy.factor(chi.as_expr()) if factor else chi.as_expr()
+        elif factor:
+            # Factor each distinct block polynomial once
+            blocks = collections.Counter(tuple(c) for c in self._get_block_char_polys())
+            chi = sympy.Mul(*[sympy.factor(sympy.Poly(c[::-1], lam).as_expr())**k for c, k in blocks.items()])
         else:
-            chi = chi.as_expr()
+            chi = sympy.Poly(self._get_char_poly_coeffs(), lam).as_expr()
+        if latex:
+            return sympy.latex(chi)
+        else:
+            return chi
+
+    def get_growth_poly(self, latex = False):
+        """
+        Returns the irreducible factor of the characteristic polynomial of the decay matrix 
+        which has the dominant eigenvalue as a root, as a sympy expression in ``lambda``.
+        In the standard case, this is Conway's polynomial of degree 71.
+        Use ``latex = True`` to return the polynomial formatted in latex.
+        """
+        chi = sympy.Poly(self._get_growth_factor(), sympy.Symbol('lambda')).as_expr()
         if latex:
             return sympy.latex(chi)
         else:
             return chi
 
+    def get_growth_constant(self, digits = 50):
+        """
+        Returns the dominant eigenvalue of the decay matrix (the growth rate of the 
+        look and say sequence) as a sympy Float with ``digits`` significant digits.
+        The root of ``get_growth_poly()`` near the floating point estimate from 
+        ``get_dom_eigenvalue()`` is refined with Newton's method at high precision.
+        The factor and the most precise root found so far are kept until the elements change, 
+        so asking for more digits later continues from the previous root.
+        """
+        assert digits > 0, "The get_growth_constant method requires a positive number of digits."
+        coeffs = self._get_growth_factor()
+        low, high = self._growth_bracket
+        if self._growth_root is None or self._growth_root[0] < digits:
+            start = (low + high) / 2 if self._growth_root is None else self._growth_root[1]
+            self._growth_root = (digits, _refine_root(coeffs, low, high, start, digits))
+        return sympy.Float(self._growth_root[1], digits)
+
+    def _get_growth_factor(self):
+        """
+        Returns the coefficients (starting with the leading coefficient) of the irreducible 
+        factor of the characteristic polynomial with the dominant eigenvalue as a root, and 
+        stores a rational interval around the dominant eigenvalue on which this factor changes sign.
+        The interval is shrunk until exactly one factor changes sign on it.
+        """
+        if self._growth_factor is None:
+            lam = sympy.Symbol('lambda')
+            factors = set()
+            for poly in self._get_block_char_polys():
+                for f, _ in sympy.factor_list(sympy.Poly(poly[::-1], lam))[1]:
+                    factors.add(tuple(int(c) for c in f.all_coeffs()))
+            estimate = fractions.Fraction(self.get_dom_eigenvalue())
+            radius = fractions.Fraction(1, 10**6)
+            while True:
+                low, high = estimate - radius, estimate + radius
+                candidates = [f for f in factors if _poly_sign(f, low) * _poly_sign(f, high) <= 0]
+                if len(candidates) == 1:
+                    break
+                assert radius > fractions.Fraction(1, 10**14), "Unable to isolate the dominant eigenvalue."
+                radius /= 10
+            self._growth_factor = list(candidates[0])
+            self._growth_bracket = (low, high)
+        return self._growth_factor
+
+    def _get_block_char_polys(self):
+        """
+        Returns the characteristic polynomials (as lists of integer coefficients starting 
+        with the constant term) of the diagonal blocks of the decay matrix, one for each 
+        strongly connected component of the decay graph. Ordering the elements by 
+        component makes the decay matrix block triangular, so the characteristic 
+        polynomial of the decay matrix is the product of these polynomials.
+        """
+        polys = []
+        for comp in self.get_components():
+            index = {id(e): i for i, e in enumerate(comp)}
+            block = [[0] * len(comp) for _ in comp]
+            for i, e in enumerate(comp):
+                for d in e.get_decay():
+                    if id(d) in index:
+                        block[i][index[id(d)]] += 1
+            polys.append(_char_poly_int(block))
+        return polys
+
+    def term_length(self, seed, n):
+        """
+        Returns the length of the ``n``-th term of the look and say sequence 
+        starting with ``seed`` (the seed is the first term), without generating the sequence.
+        The first few terms are computed directly. After that, the term is split 
+        into atoms which are decayed independently until every atom is an element 
+        of the chemistry. From then on the length is computed exactly from the decay 
+        matrix, which is raised to the required power by repeated squaring.
+        For example, ``term_length('1', 100)`` is computed almost instantly for 
+        the standard decimal chemistry.
+        """
+        assert n >= 1, "The term_length method requires a positive term number n."
+        term = seed
+        day = 1
+        while day < n and day <= _SPLIT_AGE:
+            term = self.las.say_what_you_see(term)
+            day += 1
+        if day == n:
+            return len(term)
+        # Decay atoms independently until they are all (persistent) elements:
+        index = {e.get_string(): i for i, e in enumerate(self.get_elements())}
+        atoms = collections.Counter(self.split(term))
+        while day < n and not all(atom in index for atom in atoms):
+            next_atoms = collections.Counter()
+            for atom, count in atoms.items():
+                for d in self._decay_atom(atom):
+                    next_atoms[d] += count
+            atoms = next_atoms
+            day += 1
+        if day == n:
+            return sum(len(atom) * count for atom, count in atoms.items())
+        lengths = self._element_lengths(n - day)
+        return sum(lengths[index[atom]] * count for atom, count in atoms.items())
+
+    def iter_compounds(self, seed, terms = None):
+        """
+        Lazily generates the look and say sequence starting with ``seed``, yielding 
+        each term as a compound, i.e. as a list of elements whose strings join to form 
+        the term. After the first few terms, each term is obtained from the previous one 
+        by replacing every element with its decay, so the work per term is proportional 
+        to the number of elements rather than the number of digits. 
+        Atoms which are not (yet) elements of the chemistry are given as ``Element`` objects 
+        outside of the chemistry, and their decays are computed once and memoized.
+        The parameter ``terms`` is the number of terms generated; when ``terms = None`` 
+        the sequence goes on forever.
+        """
+        if not seed: return # handles empty seed, which is falsy
+        # Every atom is labeled by its position in the list of atoms:
+        atoms = list(self.get_elements())
+        labels = {e.get_string(): i for i, e in enumerate(atoms)}
+        decays = [[labels[d.get_string()] for d in e.get_decay()] for e in atoms]
+        def label(atom):
+            if atom not in labels:
+                labels[atom] = len(atoms)
+                atoms.append(Element(atom, self.las))
+                decays.append(None)
+            return labels[atom]
+        def compound(labels_array):
+            return objects[labels_array].tolist()
+        count = 0
+        term = seed
+        while True:
+            if terms is not None and count >= terms:
+                return
+            current = numpy.array([label(atom) for atom in self.split(term)], dtype = numpy.intp)
+            objects = numpy.empty(len(atoms), dtype = object)
+            objects[:] = atoms
+            yield compound(current)
+            count += 1
+            if count > _SPLIT_AGE:
+                break
+            term = self.las.say_what_you_see(term)
+        del term
+        has_decay = None
+        while terms is None or count < terms:
+            if has_decay is None or not has_decay[current].all():
+                # Memoize the decays of new atoms and update the (flattened) decay table:
+                if has_decay is not None:
+                    for i in numpy.unique(current[~has_decay[current]]):
+                        decays[i] = [label(atom) for atom in self._decay_atom(atoms[i].get_string())]
+                has_decay = numpy.array([d is not None for d in decays])
+                decay_lengths = numpy.array([len(d) if d is not None else 0 for d in decays], dtype = numpy.intp)
+                decay_starts = numpy.cumsum(decay_lengths) - decay_lengths
+                flat_decays = numpy.array([i for d in decays if d is not None for i in d], dtype = numpy.intp)
+                objects = numpy.empty(len(atoms), dtype = object)
+                objects[:] = atoms
+                if not has_decay[current].all():
+                    continue
+            # Replace each atom with its decay:
+            lengths = decay_lengths[current]
+            ends = numpy.cumsum(lengths)
+            shifts = numpy.repeat(decay_starts[current] - (ends - lengths), lengths)
+            current = flat_decays[shifts + numpy.arange(ends[-1] if len(ends) else 0)]
+            yield compound(current)
+            count += 1
+
+    def _element_lengths(self, days):
+        """
+        Returns a list of the lengths of the strings obtained by decaying each 
+        element for the given number of days. The order of the list corresponds to 
+        the order of the list of elements.
+        """
+        elements = self.get_elements()
+        index = {e: i for i, e in enumerate(elements)}
+        decays = [[index[d] for d in e.get_decay()] for e in elements]
+        def decay_lengths(lengths):
+            return [sum([lengths[i] for i in decay]) for decay in decays]
+        lengths = [len(e.get_string()) for e in elements]
+        if days <= len(elements):
+            for _ in range(days):
+                lengths = decay_lengths(lengths)
+            return lengths
+        # By the Cayley-Hamilton Theorem, M^days = sum(r[i] M^i) where 
+        # r = x^days mod chi(x) and chi is the characteristic polynomial of 
+        # the decay matrix M. We compute r by repeated squaring.
+        r = _x_pow_mod(days, self._get_char_poly_coeffs())
+        result = [0] * len(elements)
+        for coeff in r:
+            if coeff:
+                result = [a + coeff * b for a, b in zip(result, lengths)]
+            lengths = decay_lengths(lengths)
+        return result
+
+    def _get_char_poly_coeffs(self):
+        """
+        Returns the coefficients (as integers) of the characteristic polynomial 
+        of the decay matrix, starting with the leading coefficient.
+        The characteristic polynomial does not depend on the order of the 
+        elements, so it is kept until the elements are cleared.
+        """
+        if self._char_poly_coeffs is None:
+            chi = [1]
+            for poly in self._get_block_char_polys():
+                chi = numpy.convolve(numpy.array(chi, dtype = object), numpy.array(poly, dtype = object)).tolist()
+            self._char_poly_coeffs = chi[::-1]
+        return self._char_poly_coeffs
+
     def _get_abundances(self, dec_places = 7, abundance_sum = 100):
         """
         Returns a list of relative abundances of each element.
@@ -349,17 +2104,10 @@ class Chemistry():
         """
         # Computing the eigenvector is time intensive for large chemistries, so 
         # we keep it as an attribute of the object after computing it once.
+        if not self.elements:
+            return []
         if self._eigenvector is None:
-            eigenstuff = numpy.linalg.eig(numpy.array(self.get_decay_matrix()))
-            eigenvalues = eigenstuff[0]
-            eigenvectors = eigenstuff[1]
-            index = numpy.where(eigenvalues == max(eigenvalues))
-            limiting_eigenvector_nparray = eigenvectors[:,index].real
-            # The next two lines are converting the numpy array to a list
-            limiting_eigenvector = limiting_eigenvector_nparray.tolist()
-            limiting_eigenvector = [elt[0][0] for elt in limiting_eigenvector]
-            # Now store the eigenvector as a dictionary to avoid issues with reordering elements
-            self._eigenvector = {e:limiting_eigenvector[i] for i, e in enumerate(self.get_elements())}
+            self.solve_perron()
         eigenvector_lst = [self._eigenvector[e] for e in self.get_elements()]
         abundance = [abs(round(abundance_sum * num / sum(eigenvector_lst), dec_places)) for num in eigenvector_lst]
         return abundance
@@ -380,9 +2128,10 @@ class Chemistry():
         This will not happen if the elements are named via Conway or if the parameter ``rename = False`` is passed.
         """
         assert order_on in ['abundance', 'name', 'string', 'string length', 'key'], "Invalid parameter passed to order_elements. Valid parameter are 'abundance', 'name', 'string', 'string length', and 'key'."
-        pt = self.get_periodic_table()
+        if order_on == 'abundance':
+            abundances = {e : a for e, a in zip(self.get_elements(), self._get_abundances())}
         sorted_key = {
-            'abundance': lambda e : pt[e.get_name()]['abundance'],
+            'abundance': lambda e : abundances[e],
             'name': lambda e : e.get_name(),
             'string': lambda e : e.get_string(),
             'string length': lambda e : len(e.get_string()),
@@ -395,6 +2144,8 @@ class Chemistry():
             self.elements.reverse()
         if not self.las._is_Conway and rename:
             self._name_elements()
+        else:
+            self._index_elements()
 
 class BinaryChemistry(Chemistry):
     """
@@ -411,6 +2162,125 @@ class BinaryChemistry(Chemistry):
         binary_split = sff.get_split()
         super().__init__(las, binary_split, elements)
 
+########### COMPRESSED TERMS ##############
+
+class CompressedTerm():
+    """
+    A compressed representation of the ``n``-th term of the look and say sequence 
+    starting with ``seed`` (the seed is the first term), using the LookAndSay object 
+    and splitting function of the Chemistry ``chem``. The term is never written out. 
+    Instead, it is stored as the atoms of an early term together with the 
+    decays of those atoms, where each atom with $t$ days to go expands into the atoms 
+    of its decay with $t-1$ days to go. The lengths of these expansions are memoized, 
+    which allows for ``len()``, indexing, slicing and iteration over huge terms.
+    For example, ``CompressedTerm(chem, '1', 100)[10**11]`` returns the digit at position
+    $10^{11}$ of the 100th term of the standard decimal look and say sequence.
+    """
+    def __init__(self, chem, seed, n):
+        assert n >= 1, "A CompressedTerm requires a positive term number n."
+        self.chem = chem
+        self.seed = seed
+        self.n = n
+        term = seed
+        day = 1
+        while day < n and day <= _SPLIT_AGE:
+            term = chem.las.say_what_you_see(term)
+            day += 1
+        self._depth = n - day
+        roots = chem.split(term) if self._depth else [term]
+        # Collect the atoms (and their decays) needed within the remaining days.
+        # An atom first appearing after k days only needs to be expanded for depth - k days.
+        self._atoms = []
+        self._children = []
+        horizons = []
+        ids = {}
+        def atom_id(atom, horizon):
+            if atom not in ids:
+                ids[atom] = len(self._atoms)
+                self._atoms.append(atom)
+                self._children.append(None)
+                horizons.append(horizon)
+            return ids[atom]
+        self._roots = [atom_id(atom, self._depth) for atom in roots]
+        frontier = list(range(len(self._atoms)))
+        for horizon in range(self._depth - 1, -1, -1):
+            new_frontier = []
+            for i in frontier:
+                known = len(self._atoms)
+                self._children[i] = tuple(atom_id(atom, horizon) for atom in chem._decay_atom(self._atoms[i]))
+                new_frontier += range(known, len(self._atoms))
+            frontier = new_frontier
+        # The length of the ith atom after t days is stored in self._lengths[t][i]:
+        self._lengths = [[len(atom) for atom in self._atoms]]
+        for t in range(1, self._depth + 1):
+            previous = self._lengths[-1]
+            self._lengths.append([sum([previous[k] for k in kids]) if horizon >= t else None
+                                  for kids, horizon in zip(self._children, horizons)])
+        self._root_ends = list(itertools.accumulate(self._lengths[self._depth][i] for i in self._roots))
+
+    def __repr__(self):
+        return "CompressedTerm(seed={!r}, n={})".format(self.seed, self.n)
+
+    def __str__(self):
+        return ''.join(self.iter_chunks())
+
+    def length(self):
+        """Returns the length of the term. Unlike ``len()``, this works for lengths beyond ``sys.maxsize``."""
+        return self._root_ends[-1] if self._root_ends else 0
+
+    def __len__(self):
+        return self.length()
+
+    def __getitem__(self, key):
+        length = self.length()
+        if isinstance(key, slice):
+            start, stop, step = key.indices(length)
+            if step == 1:
+                return ''.join(self.iter_chunks(start, stop))
+            if step > 0:
+                return ''.join(self.iter_chunks(start, stop))[::step]
+            return ''.join(self.iter_chunks(stop + 1, start + 1))[::step]
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError('CompressedTerm index out of range')
+        r = bisect.bisect_right(self._root_ends, key)
+        offset = key - (self._root_ends[r - 1] if r else 0)
+        i = self._roots[r]
+        for t in range(self._depth, 0, -1):
+            for k in self._children[i]:
+                if offset < self._lengths[t - 1][k]:
+                    i = k
+                    break
+                offset -= self._lengths[t - 1][k]
+        return self._atoms[i][offset]
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def iter_chunks(self, start = 0, stop = None):
+        """
+        Iterates over the term (or the part of the term between positions ``start`` 
+        and ``stop``) atom by atom, yielding the strings of the atoms.
+        The first and last strings yielded are cut off at ``start`` and ``stop``.
+        """
+        length = self.length()
+        if stop is None or stop > length:
+            stop = length
+        position = 0
+        stack = [(i, self._depth) for i in reversed(self._roots)]
+        while stack and position < stop:
+            i, t = stack.pop()
+            size = self._lengths[t][i]
+            if position + size <= start:
+                position += size
+            elif t == 0:
+                yield self._atoms[i][max(start - position, 0):stop - position]
+                position += size
+            else:
+                stack += [(k, t - 1) for k in reversed(self._children[i])]
+
 ########### ELEMENT #######################
 
 class Element():
@@ -420,13 +2290,27 @@ class Element():
     named H (short for Hydrogen) consisting of the string '22'. 
     Each element decays into a list of other elements. 
     The only methods for this class are getters and a setter.
+
+    Elements are kept small: the string is interned, the hash is computed once, and 
+    once an element belongs to a chemistry its decay is stored as an array of positions 
+    in the list of all elements discovered by that chemistry (its registry).
     """
-    def __init__(self, string, las, decay = []):
+    __slots__ = ('string', 'las', 'name', '_hash', '_registry', '_index', '_decay')
+
+    # Counts the calls to set_name, so chemistries can tell when their name index is stale
+    _renames = 0
+
+    def __init__(self, string, las, decay = None):
         super(Element, self).__init__()
-        self.string = string
+        self.string = sys.intern(string)
         self.las = las
-        self.name = string
-        self.decay = decay
+        self.name = self.string
+        self._hash = hash((self.string, las))
+        self._registry = None
+        self._index = None
+        self._decay = ()
+        if decay is not None:
+            self._set_decay(decay)
 
     def __str__(self):
         return self.name
@@ -442,16 +2326,41 @@ class Element():
 
     def __hash__(self):
         """Overrides the default implementation"""
-        return hash((self.string, self.las))
+        return self._hash
+
+    def __getstate__(self):
+        # The hash depends on the LookAndSay object, which is a different object 
+        # once unpickled, so it is left out and recomputed by __setstate__.
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != '_hash'}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self.string = sys.intern(self.string)
+        self._hash = hash((self.string, self.las))
+
+    def _register(self, registry):
+        """Appends the element to the given registry (a list of elements)."""
+        self._registry = registry
+        self._index = len(registry)
+        registry.append(self)
 
     def _set_decay(self, elements):
-        self.decay = elements
+        registry = self._registry
+        if registry is not None and all(e._registry is registry for e in elements):
+            self._decay = array.array('l', [e._index for e in elements])
+        else:
+            self._decay = tuple(elements)
 
     def get_decay(self):
-        return self.decay
+        if isinstance(self._decay, tuple):
+            return list(self._decay)
+        registry = self._registry
+        return [registry[i] for i in self._decay]
 
     def set_name(self, name):
         self.name = name
+        Element._renames += 1
 
     def get_name(self):
         return self.name
@@ -461,6 +2370,43 @@ class Element():
 
 ########### SPLIT FUNCTION FACTORY #####################
 
+def _aho_corasick(patterns):
+    """
+    Builds an Aho-Corasick automaton for the given nonempty patterns (strings or bytes). 
+    Returns the lists ``goto`` (dictionaries from characters to states), ``fail`` (the 
+    state for the longest proper suffix which is also a state) and ``matches`` (the positions 
+    in ``patterns`` of the patterns which are suffixes of the text read so far) indexed by state. 
+    State 0 is the start state.
+    """
+    goto, fail, matches = [{}], [0], [[]]
+    for k, pattern in enumerate(patterns):
+        state = 0
+        for c in pattern:
+            if c not in goto[state]:
+                goto.append({})
+                fail.append(0)
+                matches.append([])
+                goto[state][c] = len(goto) - 1
+            state = goto[state][c]
+        matches[state].append(k)
+    queue = collections.deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for c, child in goto[state].items():
+            queue.append(child)
+            f = fail[state]
+            while f and c not in goto[f]:
+                f = fail[f]
+            fail[child] = goto[f].get(c, 0)
+            matches[child] = matches[child] + matches[fail[child]]
+    return goto, fail, matches
+
+def _aho_corasick_step(goto, fail, state, c):
+    """Returns the state of the automaton after reading the character c in the given state."""
+    while state and c not in goto[state]:
+        state = fail[state]
+    return goto[state].get(c, 0)
+
 class SplitFuncFactory():
     """
     A class to help create a split function. The split function factory
@@ -468,41 +2414,143 @@ class SplitFuncFactory():
 
     * Specifying specific chunks L and R such that LR splits as L.R.
     * Specifying specific characters or chunks to always split before or after.
+
+    The declared chunks are compiled (when the split function is first used after 
+    a declaration) into two automata: one recognizing the declared chunks ending at 
+    each position and one recognizing the declared chunks starting at each position. 
+    A string is then split in a single pass, whose cost does not grow with the number of declared chunks.
     """
     def __init__(self):
         self._splitting_pairs = []
         self._chunks_before_split = []
         self._chunks_after_split = []
+        self._compiled = {}
 
     def get_split(self):
         """Returns the split function."""
-        return lambda string : self._split(string)
+        return self._split
+
+    def _compile(self, kind):
+        """
+        Compiles the declared chunks for strings of the given kind (``str`` or ``bytes``).
+        Returns a tuple consisting of the automaton for chunks on the left of a split together 
+        with, for each of its states, the length of the shortest matching chunk declared with 
+        ``declare_split_after`` and a dictionary from (positions of) right chunks of splitting 
+        pairs to the length of the shortest matching left chunk; the automaton for chunks on the 
+        right of a split together with, for each of its states, a list of the matching chunks given 
+        as (length, declared with ``declare_split_before``, positions as right chunks of splitting pairs); 
+        the length of the longest chunk on the right; whether every position has a split before it; 
+        and the positions of the empty right chunks of splitting pairs.
+        """
+        if kind in self._compiled:
+            return self._compiled[kind]
+        encode = (lambda chunk : chunk) if kind is str else (lambda chunk : chunk.encode('latin-1'))
+        # An empty chunk on the left never matches, while an empty chunk on the right always matches
+        lefts = sorted(({encode(l) for l in self._chunks_before_split} | {encode(l) for l, r in self._splitting_pairs}) - {encode('')})
+        rights = sorted(({encode(r) for r in self._chunks_after_split} | {encode(r) for l, r in self._splitting_pairs}) - {encode('')})
+        pair_rights = sorted({encode(r) for l, r in self._splitting_pairs})
+        pair_id = {r: k for k, r in enumerate(pair_rights)}
+        before = {encode(l) for l in self._chunks_before_split}
+        after = {encode(r) for r in self._chunks_after_split}
+        l_goto, l_fail, l_matches = _aho_corasick(lefts)
+        inf = float('inf')
+        l_before = [min([len(lefts[k]) for k in m if lefts[k] in before], default = inf) for m in l_matches]
+        pairs_by_left = collections.defaultdict(set)
+        for l, r in self._splitting_pairs:
+            pairs_by_left[encode(l)].add(pair_id[encode(r)])
+        l_pairs = []
+        for m in l_matches:
+            shortest = {}
+            for k in m:
+                for r in pairs_by_left.get(lefts[k], ()):
+                    shortest[r] = min(shortest.get(r, inf), len(lefts[k]))
+            l_pairs.append(shortest)
+        r_goto, r_fail, r_matches = _aho_corasick(rights)
+        r_outputs = [[(len(rights[k]), rights[k] in after, [pair_id[rights[k]]] if rights[k] in pair_id else []) for k in m] 
+                     for m in r_matches]
+        lookahead = max([len(r) for r in rights], default = 0)
+        self._compiled[kind] = ((l_goto, l_fail, l_before, l_pairs), (r_goto, r_fail, r_outputs), 
+                                lookahead, encode('') in after, [pair_id[encode('')]] if encode('') in pair_id else [])
+        return self._compiled[kind]
 
     def _split(self, string):
+        text = string if isinstance(string, str) else bytes(string)
         chunks = []
         start = 0
-        for i in range(1, len(string)):
-            if self._is_split(string[start:i], string[i:]):
-                chunks.append(string[start:i])
-                start = i
+        for p in self._split_positions([text], type(text)):
+            chunks.append(string[start:p])
+            start = p
         chunks.append(string[start:])
         return chunks
 
-    def _is_split(self, L, R):
-        if L == '' or R == '':
-            return True # pragma: no cover
-        if L[-1] == R[0]:
-            return False
-        for l in self._chunks_before_split:
-            if len(l) <= len(L) and l == L[-len(l):]:
-                return True
-        for r in self._chunks_after_split:
-            if len(r) <= len(R) and r == R[:len(r)]:
-                return True
-        for l, r in self._splitting_pairs:
-            if len(l) <= len(L) and len(r) <= len(R) and l == L[-len(l):] and r == R[:len(r)]:
-                return True
-        return False
+    def iter_split(self, chunks):
+        """
+        Splits a string given as an iterable of pieces (``str`` or bytes-like), yielding the chunks 
+        of the split function one at a time (as ``str`` or ``bytes``). A chunk is yielded as soon as 
+        the longest declared chunk after it has been read, so only the current chunk and this 
+        lookahead are kept in memory. For example, the pieces can be blocks read from a file.
+        """
+        pieces = iter(chunks)
+        first = next(pieces, None)
+        if first is None:
+            return
+        kind = str if isinstance(first, str) else bytes
+        buffer = kind()
+        offset = 0 # the position of the start of the buffer in the whole string
+        def read():
+            nonlocal buffer
+            for piece in itertools.chain([first], pieces):
+                piece = piece if kind is str else bytes(piece)
+                buffer += piece
+                yield piece
+        for p in self._split_positions(read(), kind):
+            yield buffer[:p - offset]
+            buffer = buffer[p - offset:]
+            offset = p
+        yield buffer
+
+    def _split_positions(self, pieces, kind):
+        """Yields the positions of the splits of the concatenation of the pieces of the given kind (``str`` or ``bytes``)."""
+        (l_goto, l_fail, l_before, l_pairs), (r_goto, r_fail, r_outputs), lookahead, always, empty_pairs = self._compile(kind)
+        start = 0
+        # Positions between distinct characters wait here until every declared chunk 
+        # starting at them has been read, along with the state of the left automaton there, 
+        # whether a chunk declared with declare_split_before starts there, and the right 
+        # chunks of splitting pairs starting there.
+        pending = collections.deque()
+        marks = {}
+        def is_split(i, l_state, after, right_pairs):
+            length = i - start # the left chunk only extends back to the last split
+            return (after or l_before[l_state] <= length 
+                    or any(l_pairs[l_state].get(r, length + 1) <= length for r in right_pairs))
+        l_state = r_state = 0
+        j = 0
+        previous = None
+        for piece in pieces:
+            for c in piece:
+                if j and c != previous:
+                    mark = [j, l_state, always, list(empty_pairs)]
+                    pending.append(mark)
+                    marks[j] = mark
+                previous = c
+                l_state = _aho_corasick_step(l_goto, l_fail, l_state, c)
+                r_state = _aho_corasick_step(r_goto, r_fail, r_state, c)
+                j += 1
+                for length, after, right_pairs in r_outputs[r_state]:
+                    mark = marks.get(j - length)
+                    if mark is not None:
+                        mark[2] = mark[2] or after
+                        mark[3].extend(right_pairs)
+                while pending and pending[0][0] + lookahead <= j:
+                    mark = pending.popleft()
+                    del marks[mark[0]]
+                    if is_split(*mark):
+                        start = mark[0]
+                        yield start
+        for mark in pending:
+            if is_split(*mark):
+                start = mark[0]
+                yield start
 
     def declare_splitting_pairs(self, *pairs):
         """
@@ -511,6 +2559,7 @@ class SplitFuncFactory():
         """
         for pair in pairs:
             self._splitting_pairs.append(pair)
+        self._compiled = {}
 
     def declare_split_after(self, *chunks):
         """
@@ -518,6 +2567,7 @@ class SplitFuncFactory():
         """
         for chunk in chunks:
             self._chunks_before_split.append(chunk)
+        self._compiled = {}
 
     def declare_split_before(self, *chunks):
         """
@@ -525,6 +2575,7 @@ class SplitFuncFactory():
         """
         for chunk in chunks:
             self._chunks_after_split.append(chunk)
+        self._compiled = {}
 
 ########### COSMOLOGY #####################
 
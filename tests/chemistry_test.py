@@ -68,6 +68,149 @@ def test_empty_chemistry():
     E0 = empty_chem.get_elements()[0]
     assert empty_chem.get_periodic_table() == {'': {'string': '', 'abundance': 100.0, 'decay': [E0]}}
 
+def test_decays_are_elements_of_chemistry():
+    '''Testing that the decays of elements consist of the elements of the chemistry themselves'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1', '22', '45', '9')
+    elements = {id(e) for e in chem.get_elements()}
+    assert len(chem.get_elements()) == 98
+    assert all(id(d) in elements for e in chem.get_elements() for d in e.get_decay())
+
+def test_components():
+    '''Testing the strongly connected components of the decay graph of Conway's chemistry'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('9')
+    components = chem.get_components()
+    assert [len(comp) for comp in components] == [2, 91, 1]
+    assert {e.get_name() for e in components[0]} == {'Pu9', 'Np9'}
+    assert [e.get_name() for e in components[-1]] == ['H']
+    assert len(chem.get_core_elements()) == 94
+    transient = [e.get_string() for e in chem.get_transient_elements()]
+    assert len(transient) == 17 and '1119' in transient
+
+def test_add_seeds():
+    '''Testing that adding seeds gives the same chemistry as generating all elements at once'''
+    def describe(chem):
+        return [(e.get_name(), e.get_string(), [d.get_name() for d in e.get_decay()]) for e in chem.get_elements()]
+    full = Chemistry(decimal)
+    full.generate_elements('22', '45', '9')
+    chem = Chemistry(decimal)
+    chem.generate_elements('22')
+    assert describe(chem) == [('H', '22', ['H'])]
+    chem.solve_perron()
+    chem.add_seeds('45', '9')
+    assert describe(chem) == describe(full)
+    assert len(chem.get_transient_elements()) == len(full.get_transient_elements())
+    assert sorted(map(len, chem.get_components())) == sorted(map(len, full.get_components()))
+    assert abs(chem.get_dom_eigenvalue() - full.get_dom_eigenvalue()) < 1e-12
+
+def test_binary_add_seeds():
+    '''Testing that adding seeds renames the elements of a non-Conway chemistry'''
+    binary_chem = BinaryChemistry(LookAndSay(lambda n : bin(n)[2:]))
+    binary_chem.generate_elements('0')
+    binary_chem.add_seeds('1')
+    full = BinaryChemistry(LookAndSay(lambda n : bin(n)[2:]))
+    full.generate_elements('0', '1')
+    assert [(e.get_name(), e.get_string()) for e in binary_chem.get_elements()] == [(e.get_name(), e.get_string()) for e in full.get_elements()]
+
+def test_save_and_load(tmp_path):
+    '''Testing that a saved chemistry is loaded with the same elements and computations'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1', '9')
+    eigenvalue = chem.get_dom_eigenvalue()
+    chem.save(tmp_path / 'decimal.json.gz')
+    loaded = Chemistry(decimal)
+    loaded.load(tmp_path / 'decimal.json.gz')
+    assert [e.get_name() for e in loaded.get_elements()] == [e.get_name() for e in chem.get_elements()]
+    assert loaded.get_periodic_table() == chem.get_periodic_table()
+    assert loaded.get_dom_eigenvalue() == eigenvalue
+    assert len(loaded.get_transient_elements()) == len(chem.get_transient_elements())
+    assert loaded.get_char_poly() == chem.get_char_poly()
+
+def test_generate_elements_cache_dir(tmp_path):
+    '''Testing that generate_elements reuses chemistries saved in a cache directory'''
+    binary = LookAndSay(lambda n : bin(n)[2:])
+    chem = BinaryChemistry(binary)
+    chem.generate_elements('0', cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 1
+    cached = BinaryChemistry(binary)
+    cached._generate_all_elements = None
+    cached.generate_elements('0', cache_dir=tmp_path)
+    assert cached.get_periodic_table() == chem.get_periodic_table()
+    assert cached._perron_report['iterations'] == chem._perron_report['iterations']
+    # A different seed or say function is not found in the cache
+    Chemistry(decimal).generate_elements('0', cache_dir=tmp_path)
+    BinaryChemistry(LookAndSay(lambda n : bin(n)[:1:-1])).generate_elements('0', cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 3
+
+def test_generate_elements_cache_dir_say_functions(tmp_path):
+    '''Testing that the cache tells apart say functions that agree on the first terms'''
+    Chemistry(decimal).generate_elements('1', cache_dir=tmp_path)
+    unnamed = Chemistry(LookAndSay(lambda n : str(n)))
+    unnamed.generate_elements('1', cache_dir=tmp_path)
+    assert unnamed.get_elements()[0].get_name() == 'E1'
+    late = LookAndSay(lambda n : str(n) if n < 20 else 'x')
+    assert Chemistry(late)._fingerprint(['1']) != Chemistry(LookAndSay(lambda n : str(n)))._fingerprint(['1'])
+
+def test_element_lookup():
+    '''Testing element lookups by name and string through renames and reorders'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    hydrogen = chem.get_element('H')
+    assert hydrogen.get_string() == '22'
+    assert chem.element_for_string('22') is hydrogen
+    assert chem.element_for_string('1') is None
+    assert chem.get_element('Xx') is None
+    index = chem._elements_by_name
+    assert chem.get_element('Xy') is None and chem._elements_by_name is index # misses do not rebuild the index
+    hydrogen.set_name('Hydrogen')
+    assert chem.get_element('H') is None
+    assert chem.get_element('Hydrogen') is hydrogen
+    chem.clear_elements()
+    assert chem.get_element('Hydrogen') is None
+    assert chem.element_for_string('22') is None
+    for order_on in ['string', 'abundance']:
+        negafibnary_chem.order_elements(order_on)
+        for e in negafibnary_chem.get_elements():
+            assert negafibnary_chem.get_element(e.get_name()) is e
+            assert negafibnary_chem.element_for_string(e.get_string()) is e
+
+def test_strongly_connected_components():
+    '''Testing that the components are listed in topological order'''
+    from look_and_say import _strongly_connected_components
+    successors = [[1], [2, 3], [1], [4], [3, 5], [], [0]]
+    components = _strongly_connected_components(successors)
+    assert sorted(sorted(comp) for comp in components) == [[0], [1, 2], [3, 4], [5], [6]]
+    position = {i: k for k, comp in enumerate(components) for i in comp}
+    assert all(position[i] <= position[j] for i in range(7) for j in successors[i])
+
+def test_term_length():
+    '''Testing term_length against the lengths of generated terms'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    lengths = [len(term) for term in decimal.iter_sequence('1', 40)]
+    assert [chem.term_length('1', n) for n in range(1, 41)] == lengths
+    assert chem.term_length('1', 100) == 511247092564
+
+def test_term_length_large():
+    '''Testing term_length for many terms against decaying atoms without any elements'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    no_elements_chem = Chemistry(decimal)
+    for seed in ['1', '22', '3333', '1234567']:
+        assert chem.term_length(seed, 500) == no_elements_chem.term_length(seed, 500)
+
+def test_iter_compounds():
+    '''Testing that the compounds from iter_compounds join to form the terms of the sequence'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    for seed in ['1', '22', '3333', '1234567']:
+        compounds = list(chem.iter_compounds(seed, 30))
+        assert [''.join(e.get_string() for e in compound) for compound in compounds] == list(decimal.iter_sequence(seed, 30))
+    exotic = {e.get_string() for e in compounds[-1] if e not in chem.get_elements()}
+    transuranic = {prefix + d for prefix in ['31221132221222112112322211', '1311222113321132211221121332211'] for d in '4567'}
+    assert exotic and exotic <= transuranic
+
 #### Tests for negafibnary Chemistry ############
 
 def negafibnary_say(num):
@@ -109,3 +252,212 @@ def test_negafibnary_char_poly():
     '''Testing the characteristic polynomial for the negafibnary Chemistry'''
     assert sympy.poly(negafibnary_chem.get_char_poly()).all_coeffs() == [1, -1, -1]
     assert sympy.poly(negafibnary_chem.get_char_poly(factor=False)).all_coeffs() == [1, -1, -1]
+
+def test_char_poly_int():
+    '''Testing the modular characteristic polynomial against sympy on random matrices'''
+    from look_and_say import _char_poly_int
+    rng = numpy.random.default_rng(0)
+    for n in [1, 2, 7, 40]:
+        matrix = rng.integers(-3, 4, size=(n, n)).tolist()
+        expected = sympy.Matrix(matrix).charpoly().all_coeffs()[::-1]
+        assert _char_poly_int(matrix) == [int(c) for c in expected]
+
+def test_isqrt():
+    '''Testing the integer square root against exact squares'''
+    from look_and_say import _isqrt
+    for n in list(range(1000)) + [10**40, 10**40 - 1, 2**127 - 1]:
+        root = _isqrt(n)
+        assert root * root <= n < (root + 1) ** 2
+
+def test_char_poly_blocks_match_sympy():
+    '''Testing and timing the block characteristic polynomial against sympy'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    for factor in [True, False]:
+        start = time.perf_counter()
+        expected = chem.get_char_poly(factor=factor, method='sympy')
+        sympy_time = time.perf_counter() - start
+        chem._char_poly_coeffs = None
+        start = time.perf_counter()
+        assert chem.get_char_poly(factor=factor) == expected
+        blocks_time = time.perf_counter() - start
+        print('factor={}: sympy {:.3f}s, blocks {:.3f}s'.format(factor, sympy_time, blocks_time))
+
+def test_growth_constant():
+    '''Testing Conway's constant to many digits'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    conway = sympy.Float('1.303577269034296391257099112152551890730702504659404875754861390628550887852461557126815766864425226', 100)
+    assert str(chem.get_growth_constant(digits=20)) == '1.3035772690342963913'
+    assert abs(chem.get_growth_constant(digits=90) - conway) < 1e-88
+    assert sympy.degree(chem.get_growth_poly()) == 71
+
+def test_negafibnary_growth_constant():
+    '''Testing the golden ratio as the growth constant for the negafibnary Chemistry'''
+    golden = sympy.GoldenRatio.evalf(40)
+    assert abs(negafibnary_chem.get_growth_constant(digits=40) - golden) < 1e-38
+    lam = sympy.Symbol('lambda')
+    assert negafibnary_chem.get_growth_poly() == lam**2 - lam - 1
+
+def test_negafibnary_sparse_decay_matrix():
+    '''Testing the sparse decay matrix for the negafibnary Chemistry'''
+    negafibnary_chem.order_elements('abundance')
+    sparse = negafibnary_chem.get_sparse_decay_matrix()
+    assert sparse.indptr.tolist() == [0, 2, 3]
+    assert sparse.indices.tolist() == [0, 1, 0]
+    assert sparse.data.tolist() == [1, 1, 1]
+    assert sparse.dot([2, 3]).tolist() == [5, 2]
+    assert sparse.rdot([2, 3]).tolist() == [5, 2]
+    assert negafibnary_chem.get_sparse_decay_matrix() is sparse
+    negafibnary_chem.order_elements('abundance', reverse=True)
+    assert negafibnary_chem.get_sparse_decay_matrix().todense() == [[0, 1], [1, 1]]
+
+def test_negafibnary_solve_perron():
+    '''Testing the Perron-Frobenius solver for the negafibnary Chemistry'''
+    report = negafibnary_chem.solve_perron()
+    assert report['converged']
+    assert abs(report['eigenvalue'] - (1 + 5 ** 0.5) / 2) < 1e-12
+    assert abs(sum(report['eigenvector'].values()) - 1) < 1e-12
+    assert negafibnary_chem.solve_perron() is report
+
+def test_solve_perron_matches_dense():
+    '''Testing the Perron-Frobenius solver against a dense eigensolver'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    report = chem.solve_perron()
+    eigenvalues = numpy.linalg.eigvals(numpy.array(chem.get_decay_matrix(), dtype=float))
+    assert report['converged']
+    assert abs(report['eigenvalue'] - max(eigenvalues.real)) < 1e-10
+    assert chem.get_dom_eigenvalue() == report['eigenvalue']
+    dense = chem.solve_perron(tol=1e-16, max_iterations=0)
+    assert not dense['converged']
+    assert abs(dense['eigenvalue'] - report['eigenvalue']) < 1e-10
+
+def test_periodic_table_cache():
+    '''Testing that periodic tables are cached, copied, and invalidated'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    table = chem.get_periodic_table()
+    table['H']['decay'].append('X')
+    assert chem.get_periodic_table() == chem.get_periodic_table(dec_places=7, abundance_sum=100)
+    assert chem.get_periodic_table()['H']['decay'] == [chem.get_element('H')]
+    assert chem.get_periodic_table(abundance_sum=10**6)['H']['abundance'] == 91790.383216
+    chem.get_element('H').set_name('Hydrogen')
+    assert 'Hydrogen' in chem.get_periodic_table()
+    chem.clear_elements()
+    assert chem.get_periodic_table() == {}
+
+def test_chemistry_iter_split():
+    '''Testing the streaming split of a chemistry for each kind of split function'''
+    assert list(Chemistry(decimal).iter_split(['12111', '32213'])) == ['12', '1113', '22', '13']
+    assert list(negafibnary_chem.iter_split(['1011', '01'])) == negafibnary_chem.split('101101')
+    chem = Chemistry(decimal, split=lambda string : list(string))
+    assert list(chem.iter_split(['12', '3'])) == ['1', '2', '3']
+
+def test_profile_abundances(tmp_path):
+    '''Testing that the abundance profile of a term matches counting its split'''
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    term = '1'
+    for _ in range(35):
+        term = decimal.say_what_you_see(term)
+    expected = collections.Counter(split_Conway(term))
+    path = tmp_path / 'term.txt'
+    path.write_text(term)
+    for source, workers in [(term, 1), (term, 2), (term.encode(), 2), (path, 2)]:
+        report = chem.profile_abundances(source, workers=workers, shard_size=2**10)
+        assert report['shards'] > 1
+        assert report['atoms'] == sum(expected.values())
+        counts = {e.get_string(): report['elements'][e.get_name()]['count'] for e in chem.get_elements()}
+        assert collections.Counter(counts) + report['exotic'] == expected
+    with open(path, 'rb') as f:
+        f.read(100)
+        report = chem.profile_abundances(f, workers=2, shard_size=2**10)
+    assert report['atoms'] == sum(collections.Counter(split_Conway(term[100:])).values())
+    assert chem.profile_abundances(io.BytesIO(term.encode()), workers=1)['atoms'] == sum(expected.values())
+    assert chem.profile_abundances('22')['elements']['H']['observed'] == 100
+    assert chem.profile_abundances('2222')['exotic'] == collections.Counter({'2222': 1})
+
+def test_profile_abundances_binary():
+    '''Testing the abundance profile with a split function from a SplitFuncFactory'''
+    binary = LookAndSay(lambda n : bin(n)[2:])
+    binary_chem = BinaryChemistry(binary)
+    binary_chem.generate_elements('1')
+    term = '1'
+    for _ in range(25):
+        term = binary.say_what_you_see(term)
+    report = binary_chem.profile_abundances(term, workers=2, shard_size=2**8)
+    assert report['shards'] > 1
+    counts = {e.get_string(): report['elements'][e.get_name()]['count'] for e in binary_chem.get_elements()}
+    assert collections.Counter(counts) + report['exotic'] == collections.Counter(binary_chem.split(term))
+
+def test_profile_abundances_exact_cuts():
+    '''Testing that small shards of random strings are counted exactly'''
+    rng = numpy.random.default_rng(0)
+    sff = SplitFuncFactory()
+    sff.declare_split_after('12', '3')
+    sff.declare_splitting_pairs(('21', '13'), ('2', '311'))
+    for split in [split_Conway, sff.get_split()]:
+        chem = Chemistry(decimal, split=split)
+        for _ in range(20):
+            term = ''.join(rng.choice(list('1123'), size=rng.integers(1, 400)))
+            report = chem.profile_abundances(term, workers=1, shard_size=int(rng.integers(1, 30)))
+            assert report['exotic'] == collections.Counter(split(term))
+        report = chem.profile_abundances(term, workers=2, shard_size=16)
+        assert report['exotic'] == collections.Counter(split(term))
+
+def test_profile_abundances_guessed_cuts():
+    '''Testing that guessing the cuts for an arbitrary split function issues a warning'''
+    chem = Chemistry(decimal, split=lambda string : list(string))
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        report = chem.profile_abundances('1213' * 1000, shard_size=100)
+    assert [w.category for w in caught] == [RuntimeWarning]
+    assert report['exotic'] == collections.Counter({'1': 2000, '2': 1000, '3': 1000})
+
+def test_validate_split():
+    '''Testing the split validator on valid and invalid split functions'''
+    assert Chemistry(decimal).validate_split(['1', '2', '3', '22', '1123'], 20, workers=2) is None
+    sff = SplitFuncFactory()
+    sff.declare_split_before('1')
+    binary = LookAndSay(lambda n : bin(n)[2:])
+    assert Chemistry(binary, split=sff.get_split()).validate_split(['0', '1', '10'], 20) is None
+    every_character = Chemistry(decimal, split=lambda string : list(string))
+    report = every_character.validate_split(['1'], 10)
+    assert (report['seed'], report['left'], report['right']) == ('1', '1', '1')
+    sff = SplitFuncFactory()
+    sff.declare_split_after('2')
+    report = Chemistry(decimal, split=sff.get_split()).validate_split(['3', '1'], 12, workers=2)
+    assert report['seed'] == '3'
+    left, right = report['left'], report['right']
+    assert len(left) + len(right) == 2 and left.endswith('2')
+    days = report['failed_day'] - report['day']
+    for _ in range(days):
+        left, right = decimal.say_what_you_see(left), decimal.say_what_you_see(right)
+    whole = report['left'] + report['right']
+    for _ in range(days):
+        whole = decimal.say_what_you_see(whole)
+    assert left + right != whole
+
+def test_validate_split_stop():
+    '''Testing that checking a seed stops once the stop event is set'''
+    from look_and_say import _validate_seed
+    every_character = lambda string : list(string)
+    assert _validate_seed(decimal, every_character, '1', 10, 2) is not None
+    stop = multiprocessing.Event()
+    stop.set()
+    assert _validate_seed(decimal, every_character, '1', 10, 2, stop) is None
+    assert Chemistry(decimal).validate_split(['1'], 45, workers=1) is None
+
+def test_atom_decays_follow_split():
+    '''Testing that memoized atom decays are forgotten when the split function changes'''
+    every_character = lambda string : list(string)
+    chem = Chemistry(decimal)
+    chem.generate_elements('1')
+    chem.term_length('3333', 6)
+    chem.split = every_character
+    chem.clear_elements()
+    chem.generate_elements('1')
+    fresh = Chemistry(decimal, split=every_character)
+    fresh.generate_elements('1')
+    assert chem.term_length('3333', 6) == fresh.term_length('3333', 6) == 32
@@ -0,0 +1,40 @@
+from look_and_say import *
+
+decimal = LookAndSay()
+decimal_chem = Chemistry(decimal)
+decimal.generate_sequence(seed='1', terms=30)
+terms = decimal.get_sequence()
+
+def test_compressed_term_string():
+    '''Testing that a CompressedTerm expands to the corresponding term'''
+    for n in [1, 2, 3, 4, 30]:
+        term = CompressedTerm(decimal_chem, '1', n)
+        assert str(term) == terms[n-1]
+        assert len(term) == len(terms[n-1])
+        assert ''.join(term) == terms[n-1]
+
+def test_compressed_term_indexing():
+    '''Testing indexing a CompressedTerm'''
+    term = CompressedTerm(decimal_chem, '1', 30)
+    for k in list(range(0, len(term), 97)) + [-1, -len(term)]:
+        assert term[k] == terms[29][k]
+
+def test_compressed_term_slicing():
+    '''Testing slicing a CompressedTerm'''
+    term = CompressedTerm(decimal_chem, '1', 30)
+    for a, b, step in [(0, 100, 1), (1000, 1234, 1), (-50, None, 1), (3, 4000, 7), (4000, 3, -5), (None, None, -1)]:
+        assert term[a:b:step] == terms[29][a:b:step]
+
+def test_compressed_term_chunks():
+    '''Testing the chunked iteration of a CompressedTerm'''
+    term = CompressedTerm(decimal_chem, '1', 30)
+    chunks = list(term.iter_chunks(100, 200))
+    assert ''.join(chunks) == terms[29][100:200]
+    assert all(len(chunk) < 50 for chunk in chunks)
+
+def test_huge_compressed_term():
+    '''Testing a CompressedTerm far beyond the size of a materialized term'''
+    term = CompressedTerm(decimal_chem, '1', 100)
+    assert term.length() == 511247092564
+    assert term[10**11:10**11 + 30] == '131221121311121312211213211321'
+    assert term[-5:] == '13211'
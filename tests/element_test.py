@@ -43,3 +43,29 @@ def test_element_hash():
     assert {a, b, c, a} == {a, b, c}
     assert {a, c} != {a}
 
+
+def test_element_decay_indices():
+    '''Testing the compact representation of decays'''
+    for e in binary_chem.get_elements():
+        assert not hasattr(e, '__dict__')
+        decay = e.get_decay()
+        assert isinstance(decay, list)
+        assert all(d in binary_chem.get_elements() for d in decay)
+        assert [binary_chem._registry[i] for i in e._decay] == decay
+
+def test_standalone_element():
+    '''Testing Element objects outside of a chemistry'''
+    a = Element('10', binary_ls)
+    assert a.get_decay() == []
+    b = Element('1' + '110', binary_ls, decay = [a, a])
+    assert b.get_decay() == [a, a]
+    assert b.get_string() is sys.intern('1110')
+
+def test_pickled_element_hash():
+    '''Testing that unpickled elements hash like equal elements built afresh'''
+    chem = pickle.loads(pickle.dumps(binary_chem))
+    elements = set(chem.get_elements())
+    for e in chem.get_elements():
+        fresh = Element(e.get_string(), chem.las)
+        assert fresh == e and hash(fresh) == hash(e) and fresh in elements
+        assert e.get_decay() == [chem.element_for_string(d.get_string()) for d in e.get_decay()]
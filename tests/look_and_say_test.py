@@ -56,3 +56,120 @@ def test_2_parameter_say_sequence():
     assert stutter_echo.get_last_length_ratio() == 1.5
 
 
+
+##### Testing the resolution of the say function ######
+def test_builtin_say_function():
+    '''Testing say functions whose signatures cannot be inspected'''
+    assert LookAndSay(str).say_what_you_see('11133222200') == '31234220'
+
+def test_one_parameter_say_with_default():
+    '''Testing a say function whose second parameter is an optional setting'''
+    assert LookAndSay(numpy.base_repr).say_what_you_see('1110001') == '11111011'
+
+def test_two_parameter_say_with_default():
+    '''Testing a say function whose optional second parameter is the digit'''
+    def stutter_say(num, char = '0'):
+        return char * num + str(num)
+    assert LookAndSay(stutter_say).say_what_you_see('1112') == '111321'
+
+def test_chunk_table_is_bounded():
+    '''Testing that the memoized chunk decays do not grow without bound'''
+    from look_and_say import _CHUNK_TABLE_SIZE
+    las = LookAndSay()
+    las.say_what_you_see(''.join(str(i % 10) * i for i in range(1, _CHUNK_TABLE_SIZE + 100)))
+    assert len(las._chunk_table) == _CHUNK_TABLE_SIZE
+
+##### Testing the lazy sequence generators ######
+def test_iter_sequence():
+    '''Testing that iter_sequence agrees with generate_sequence'''
+    assert list(decimal.iter_sequence('1', 6)) == ['1', '11', '21', '1211', '111221', '312211']
+    assert list(decimal.iter_sequence('', 6)) == []
+
+def test_generate_sequence_keeps_seed():
+    '''Testing that generate_sequence keeps the seed when fewer than one term is asked for'''
+    las = LookAndSay()
+    las.generate_sequence('1', 0)
+    assert las.get_sequence() == ['1']
+    assert list(las.iter_sequence('1', 0)) == []
+
+def test_iter_sequence_forever():
+    '''Testing iter_sequence without a bound on the number of terms'''
+    terms = decimal.iter_sequence('1')
+    for _ in range(30):
+        term = next(terms)
+    assert len(term) == 4462
+
+def test_iter_term_stats():
+    '''Testing the statistics produced by iter_term_stats'''
+    stats = list(stutter_echo.iter_term_stats('2', 4))
+    assert [s['length'] for s in stats] == [1, 5, 10, 15]
+    assert stats[-1]['histogram'] == {'3': 5, '2': 5, '1': 2, '5': 3}
+
+##### Testing the say_what_you_see engines ######
+def test_numpy_engine():
+    '''Testing that the numpy engine agrees with the python engine'''
+    for say in [None, binary_say, stutter_echo_say]:
+        python_las = LookAndSay(say, engine='python')
+        numpy_las = LookAndSay(say, engine='numpy')
+        for term in python_las.iter_sequence('1', 12):
+            assert numpy_las.say_what_you_see(term) == python_las.say_what_you_see(term)
+    assert LookAndSay(engine='numpy').say_what_you_see('1'*10**6 + '22') == '1000000122'
+
+def test_numpy_engine_multibyte_characters():
+    '''Testing that the numpy engine falls back on python for characters that are not single bytes'''
+    las = LookAndSay(lambda n : '✓' * n, engine='numpy')
+    assert las.say_what_you_see('1122') == '✓✓1✓✓2'
+    assert las.say_what_you_see('ab✓') == '✓a✓b✓✓'
+
+def test_benchmark_engines():
+    '''Testing the report produced by benchmark_engines'''
+    report = decimal.benchmark_engines('1211' * 1000, repeat=1)
+    assert set(report) == {'python', 'numpy', 'speedup'}
+    assert decimal.engine == 'auto'
+
+##### Testing the parallel say_what_you_see ######
+def test_parallel_say_what_you_see():
+    '''Testing that processing a string in parallel agrees with a single process'''
+    parallel = LookAndSay(workers=2, parallel_threshold=0)
+    for term in decimal.iter_sequence('1', 25):
+        assert parallel.say_what_you_see(term) == decimal.say_what_you_see(term)
+    assert parallel.say_what_you_see('1'*1000 + '2') == '1000112'
+
+def test_parallel_say_what_you_see_fallback():
+    '''Testing that an unpicklable say function falls back on a single process'''
+    parallel = LookAndSay(lambda n : str(n), workers=2, parallel_threshold=0)
+    assert parallel.say_what_you_see('11133222200') == '31234220'
+
+def check_say(num):
+    return '✓' * num
+
+def test_parallel_say_what_you_see_multibyte_decays():
+    '''Testing that decays which are not single bytes fall back on a single process'''
+    parallel = LookAndSay(check_say, workers=2, parallel_threshold=0)
+    assert parallel.say_what_you_see('1122') == '✓✓1✓✓2'
+    parallel.close_pool()
+
+def test_parallel_pool_is_reused():
+    '''Testing that the process pool is kept between calls and honours the python engine'''
+    parallel = LookAndSay(workers=2, parallel_threshold=0, engine='python')
+    assert parallel.say_what_you_see('1122333') == '212233'
+    pool = parallel._pool
+    assert parallel.say_what_you_see('1' * 30) == '301'
+    assert parallel._pool is pool
+    parallel.close_pool()
+    assert parallel._pool is None
+
+##### Testing the batch API ######
+def test_iter_batch():
+    '''Testing iter_batch in a pool of processes against generate_sequence'''
+    seeds = ['1', '22', '', '3', '1211', '312211'] * 5
+    results = list(decimal.iter_batch(iter(seeds), 8, workers=2, chunksize=4))
+    assert [seed for seed, _ in results] == seeds
+    for seed, last in results:
+        decimal.generate_sequence(seed, 8)
+        assert last == (decimal.get_sequence()[-1] if seed else None)
+
+def test_iter_batch_reducers():
+    '''Testing the reducers of iter_batch in the current process'''
+    assert list(decimal.iter_batch(['1', '22'], 5, reducer='lengths', workers=1)) == [('1', [1, 2, 2, 4, 6]), ('22', [2, 2, 2, 2, 2])]
+    assert list(decimal.iter_batch(['1', '22'], 5, reducer=lambda terms : sum(1 for _ in terms), workers=1)) == [('1', 5), ('22', 5)]
@@ -0,0 +1,42 @@
+from look_and_say import *
+
+decimal = LookAndSay()
+decimal.generate_sequence(seed='1', terms=25)
+terms = decimal.get_sequence()
+
+def test_store_sequence(tmp_path):
+    '''Testing that the stored sequence agrees with generate_sequence'''
+    store = SequenceStore(tmp_path)
+    decimal.store_sequence(store, '1', 25, block_size=64)
+    assert len(store) == 25
+    assert [store.get_term(i) for i in range(25)] == terms
+    assert isinstance(store[-1], memoryview)
+    assert bytes(store[-1]) == terms[-1].encode()
+
+def test_resume_stored_sequence(tmp_path):
+    '''Testing that a sequence can be continued from a reopened store'''
+    decimal.store_sequence(SequenceStore(tmp_path), '1', 10)
+    store = SequenceStore(tmp_path)
+    assert len(store) == 10
+    decimal.store_sequence(store, '1', 25)
+    assert [store.get_term(i) for i in range(25)] == terms
+
+def test_interrupted_write(tmp_path):
+    '''Testing that an interrupted write does not end up in the store'''
+    store = SequenceStore(tmp_path)
+    store.append('1211')
+    try:
+        with store.writer() as write:
+            write(b'1112')
+            raise KeyboardInterrupt
+    except KeyboardInterrupt:
+        pass
+    store.append('312211')
+    store = SequenceStore(tmp_path)
+    assert [store.get_term(i) for i in range(len(store))] == ['1211', '312211']
+
+def test_stream_say_what_you_see():
+    '''Testing stream_say_what_you_see with blocks smaller than the runs'''
+    pieces = []
+    decimal.stream_say_what_you_see(b'1' * 100 + b'22' + b'3' * 7, pieces.append, block_size=10)
+    assert b''.join(pieces) == b'100122' + b'73'
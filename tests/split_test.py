@@ -22,6 +22,43 @@ def test_split_Conway_multiple_splits2():
     '''Testing the splitting of another string that splits at multiple positions'''
     assert split_Conway('132211132122311229') == ['13', '22', '111321', '22', '311', '22', '9']
 
+def _split_Conway_by_pairs(string):
+    '''The splitting of a string by testing every pair of prefix and suffix'''
+    from look_and_say import _is_split_pair_Conway
+    chunks = []
+    start = 0
+    for i in range(1, len(string)):
+        if _is_split_pair_Conway(string[start:i], string[i:]):
+            chunks.append(string[start:i])
+            start = i
+    chunks.append(string[start:])
+    return chunks
+
+def test_split_Conway_boundaries():
+    '''Testing the boundaries of the chunks of split_Conway'''
+    assert split_Conway_boundaries('12111322138127').tolist() == [0, 2, 6, 8, 11, 13, 14]
+    assert split_Conway_boundaries('').tolist() == [0, 0]
+
+def test_split_Conway_random_strings():
+    '''Testing split_Conway and split_Conway_boundaries against the pairwise splitting theorem'''
+    rng = numpy.random.default_rng(1)
+    for _ in range(2000):
+        string = ''.join(rng.choice(list('1112223345'), size=rng.integers(1, 15)))
+        bounds = split_Conway_boundaries(string).tolist()
+        expected = _split_Conway_by_pairs(string)
+        assert [string[a:b] for a, b in zip(bounds[:-1], bounds[1:])] == expected
+        assert split_Conway(string) == expected
+
+def test_split_Conway_long_term_and_buffers():
+    '''Testing split_Conway on a long term given as a string, bytes and a memoryview'''
+    las = LookAndSay()
+    las.generate_sequence('1', 25)
+    term = las.get_sequence()[-1]
+    expected = _split_Conway_by_pairs(term)
+    assert split_Conway(term) == expected
+    assert split_Conway(term.encode()) == [chunk.encode() for chunk in expected]
+    assert [bytes(chunk) for chunk in split_Conway(memoryview(term.encode()))] == [chunk.encode() for chunk in expected]
+
 def test_split_func_factory_declare_split_after_0():
     '''Testing the declare_split_after method after runs of 0's'''
     sff = SplitFuncFactory()
@@ -59,3 +96,61 @@ def test_split_func_factory_declare_splitting_pairs_multiple():
     sff.declare_splitting_pairs(('311', '223'), ('0', '1'))
     split = sff.get_split()
     assert split('12311223323112011200011110234234') == ['12311', '2233231120', '112000', '11110234234']
+
+def _is_split_by_rules(L, R, after, before, pairs):
+    '''The splitting condition of a SplitFuncFactory, checked rule by rule'''
+    if L[-1] == R[0]:
+        return False
+    return (any(len(l) <= len(L) and l == L[-len(l):] for l in after)
+            or any(len(r) <= len(R) and r == R[:len(r)] for r in before)
+            or any(len(l) <= len(L) and len(r) <= len(R) and l == L[-len(l):] and r == R[:len(r)] for l, r in pairs))
+
+def test_split_func_factory_random_rules():
+    '''Testing the compiled split function against the rules on random strings'''
+    rng = numpy.random.default_rng(2)
+    def random_chunk():
+        return ''.join(rng.choice(list('0123'), size=rng.integers(0, 4)))
+    for _ in range(300):
+        after = [random_chunk() for _ in range(rng.integers(0, 4))]
+        before = [random_chunk() for _ in range(rng.integers(0, 4))]
+        pairs = [(random_chunk(), random_chunk()) for _ in range(rng.integers(0, 4))]
+        sff = SplitFuncFactory()
+        split = sff.get_split()
+        sff.declare_split_after(*after)
+        sff.declare_split_before(*before)
+        sff.declare_splitting_pairs(*pairs)
+        for _ in range(5):
+            string = ''.join(rng.choice(list('0123'), size=rng.integers(1, 20)))
+            expected = []
+            start = 0
+            for i in range(1, len(string)):
+                if _is_split_by_rules(string[start:i], string[i:], after, before, pairs):
+                    expected.append(string[start:i])
+                    start = i
+            expected.append(string[start:])
+            assert split(string) == expected
+            assert split(string.encode()) == [chunk.encode() for chunk in expected]
+
+def test_iter_split_Conway():
+    '''Testing the streaming Conway splitter on a term given in pieces of various sizes'''
+    las = LookAndSay()
+    las.generate_sequence('1', 30)
+    term = las.get_sequence()[-1]
+    for size in [1, 5, 6, 7, 100, 10**4]:
+        pieces = [term[i:i + size] for i in range(0, len(term), size)]
+        assert list(iter_split_Conway(pieces)) == split_Conway(term)
+        assert list(iter_split_Conway(p.encode() for p in pieces)) == split_Conway(term.encode())
+    assert list(iter_split_Conway(iter('1211132213'))) == ['12', '1113', '22', '13']
+    assert list(iter_split_Conway([])) == []
+
+def test_split_func_factory_iter_split():
+    '''Testing the streaming split of a SplitFuncFactory on a string given in pieces'''
+    sff = SplitFuncFactory()
+    sff.declare_split_after('0')
+    sff.declare_splitting_pairs(('12', '34'), ('1', '0000'))
+    rng = numpy.random.default_rng(3)
+    string = ''.join(rng.choice(list('0123456'), size=5000))
+    for size in [1, 3, 4, 1000]:
+        pieces = [string[i:i + size] for i in range(0, len(string), size)]
+        assert list(sff.iter_split(pieces)) == sff.get_split()(string)
+        assert list(sff.iter_split(memoryview(p.encode()) for p in pieces)) == sff.get_split()(string.encode())